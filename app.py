@@ -1,26 +1,44 @@
 import streamlit as st
 import os
-from scrape import get_jobs_from_remoteok
-from match_resume import analyze_resume_for_job
+from scrape import iter_jobs_from_remoteok
+from job_details import JobEnricher
+from match_resume import analyze_resume_for_job, relevant_resume_text, resume_analysis
+from match_matrix import build_match_matrix
+import pandas as pd
+from structured_output import get_repair_stats
 from urllib.parse import quote
 from datetime import datetime
 
 # Import your LLM and PromptTemplate for cold email generation
-from langchain_groq import ChatGroq
+from groq_scheduler import ScheduledChatGroq, BATCH, scheduler
 from langchain_core.prompts import PromptTemplate
 
 # Import mock interview functions - Fixed imports
-from interview.speech_to_text import record_audio, transcribe_with_groq
+from interview.speech_to_text import record_audio, transcribe_with_groq, calibrate_microphone
 # Updated imports to match your file structure
 from interview.conversation import take_interview, sanitize_content
 from interview.captool import analyze_image_with_query
-from interview.text_to_speech import text_to_speech_with_gtts
+from interview.text_to_speech import text_to_speech_with_gtts, synthesize_with_gtts, play_audio_file
+from interview.speculation import Speculator, conversation_fingerprint
+
+from task_queue import job_queue, FAILED, CANCELLED
 
 import threading
 import time
+import uuid
+from concurrent.futures import as_completed
+
+# How often the page re-runs while background jobs are in flight
+POLL_INTERVAL = 0.5
 
 # Initialize LLM once
-llm = ChatGroq(model_name="llama-3.3-70b-versatile")
+llm = ScheduledChatGroq(model_name="llama-3.3-70b-versatile", priority=BATCH)
+
+@st.cache_resource
+def get_job_enricher():
+    # Shared by all sessions so the fetch pool and description cache are process-wide
+    # Pool size and per-host limit come from JOB_DETAILS_WORKERS / JOB_DETAILS_PER_HOST
+    return JobEnricher()
 
 def generate_email_for_job(job: dict, resume_text: str) -> str:
     prompt = PromptTemplate.from_template("""
@@ -54,10 +72,6 @@ def generate_email_for_job(job: dict, resume_text: str) -> str:
     })
     return res.content
 
-def read_resume_text(resume_path):
-    with open(resume_path, "r", encoding="utf-8") as f:
-        return f.read()
-
 def read_resume_file(resume_path):
     """Read resume content from file"""
     try:
@@ -66,17 +80,21 @@ def read_resume_file(resume_path):
     except Exception as e:
         return f"Error reading resume: {str(e)}"
 
-def play_audio_async(text):
-    """Play audio in a separate thread"""
+def play_audio_async(text, scratch_dir=".", audio_file=None):
+    """Play audio in a separate thread, using `audio_file` if it was already synthesized"""
     def play_audio():
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = f"temp_audio_{timestamp}.mp3"
-            text_to_speech_with_gtts(text, audio_file)
+            if audio_file and os.path.exists(audio_file):
+                play_file = audio_file
+                play_audio_file(play_file)
+            else:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                play_file = os.path.join(scratch_dir, f"temp_audio_{timestamp}.mp3")
+                text_to_speech_with_gtts(text, play_file)
                 
             time.sleep(2)
-            if os.path.exists(audio_file):
-                os.remove(audio_file)
+            if os.path.exists(play_file):
+                os.remove(play_file)
         except Exception as e:
             st.error(f"Audio playback error: {str(e)}")
     
@@ -92,6 +110,189 @@ def get_vision_context():
     except Exception as e:
         return f"Vision unavailable: {str(e)}"
 
+def session_scratch_dir():
+    return job_queue.scratch_dir(st.session_state.session_id)
+
+def submit_job(slot, fn, *args, interactive=False, **kwargs):
+    """
+    Queue `fn(ctx, *args, **kwargs)` for this session and remember it under `slot`.
+    If the slot's job is still running it is returned instead of starting a second one.
+    """
+    if slot_busy(slot):
+        return job_in_slot(slot)
+    job = job_queue.submit(
+        fn, *args, name=slot, session_id=st.session_state.session_id, interactive=interactive, **kwargs
+    )
+    st.session_state.jobs[slot] = job.id
+    return job
+
+def job_in_slot(slot):
+    job_id = st.session_state.jobs.get(slot)
+    return job_queue.get(job_id) if job_id else None
+
+def slot_busy(slot):
+    job = job_in_slot(slot)
+    return job is not None and not job.finished
+
+def collect_job(slot, label, render_partial=None):
+    """
+    Show progress (and a cancel button) for the job in `slot` while it runs.
+    Returns the job once it has finished successfully, after which the slot is freed.
+    """
+    job = job_in_slot(slot)
+    if job is None:
+        st.session_state.jobs.pop(slot, None)
+        return None
+    if not job.finished:
+        col1, col2 = st.columns([4, 1])
+        col1.progress(job.progress, text=f"{label} {job.message}".strip())
+        if col2.button("✖ Cancel", key=f"cancel_{slot}"):
+            job.cancel()
+        if render_partial and job.partial:
+            render_partial(job.partial)
+        return None
+
+    del st.session_state.jobs[slot]
+    if job.status == FAILED:
+        st.error(f"{label} failed: {job.error}")
+        return None
+    if job.status == CANCELLED:
+        st.warning(f"{label} cancelled.")
+        return None
+    return job
+
+def cancel_slot(slot):
+    job = job_in_slot(slot)
+    if job is not None:
+        job.cancel()
+    st.session_state.jobs.pop(slot, None)
+
+def jobs_running():
+    return any(job and not job.finished for job in map(job_in_slot, list(st.session_state.jobs)))
+
+def render_found_jobs(found_jobs):
+    # Show jobs as soon as their rows load instead of waiting for the whole scrape
+    for found in found_jobs:
+        st.markdown(f"- **{found.get('title', 'N/A')}** at {found.get('company', 'N/A')} ({found.get('location', 'N/A')})")
+
+# Background job functions: these run on the worker pool and must not touch `st`
+
+def scrape_jobs_task(ctx, keyword, location, max_results, enricher):
+    job_listings = []
+    detail_futures = []
+    scraper = iter_jobs_from_remoteok(keyword, location, max_results=max_results)
+    finished = False
+    try:
+        for job in scraper:
+            job_listings.append(job)
+            # Full descriptions are fetched in the background while scraping continues
+            detail_futures.append(enricher.submit(job))
+            ctx.report(
+                progress=0.5 * len(job_listings) / max_results,
+                message=f"Found {len(job_listings)} jobs so far...",
+                partial=list(job_listings)
+            )
+        # Closing the generator quits the browser before waiting for the descriptions
+        scraper.close()
+
+        for done, future in enumerate(as_completed(detail_futures), start=1):
+            ctx.report(
+                progress=0.5 + 0.5 * done / len(detail_futures),
+                message=f"Fetched {done}/{len(detail_futures)} job descriptions"
+            )
+        finished = True
+    finally:
+        # Also quits the browser and drops pending fetches when the job is cancelled or fails
+        scraper.close()
+        if not finished:
+            for future in detail_futures:
+                future.cancel()
+        enricher.cache.save()
+    return job_listings
+
+def analyze_task(ctx, resume_path, job_posting):
+    ctx.report(message="Analyzing resume...")
+    return analyze_resume_for_job(resume_path, job_posting)
+
+def email_task(ctx, resume_path, job):
+    ctx.report(message="Generating cold email...")
+    resume_text = relevant_resume_text(resume_path, f"{job.get('title', '')}\n{job.get('job_posting', '')}")
+    return generate_email_for_job(job, resume_text)
+
+def match_matrix_task(ctx, variant_paths, job_listings, top_k):
+    resumes = {}
+    try:
+        for i, (name, path) in enumerate(variant_paths.items()):
+            ctx.report(progress=0.2 * i / len(variant_paths), message=f"Reading {name}...")
+            resumes[name] = resume_analysis(path)
+        ctx.report(progress=0.2, message="Scoring resumes against jobs...")
+        return build_match_matrix(resumes, job_listings, top_k=top_k)
+    finally:
+        for path in variant_paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+def interviewer_turn_task(ctx, job_title, job_description, resume_text, conversation=None):
+    ctx.report(message="Looking at the camera...")
+    vision_context = get_vision_context()
+    ctx.check_cancelled()
+
+    if conversation:
+        conversation_context = "\n".join([
+            f"{msg['role'].title()}: {msg['content']}"
+            for msg in conversation[-3:]
+        ])
+        vision_context = f"Previous conversation:\n{conversation_context}\n\nVision: {vision_context}"
+
+    ctx.report(progress=0.3, message="Thinking of the next question...")
+    interviewer_response = take_interview(job_title, job_description, resume_text, vision_context)
+    return sanitize_content(interviewer_response)
+
+def next_turn_task(ctx, job_title, job_description, resume_text, conversation=None):
+    """Interviewer turn plus its speech, synthesized up front so playback can start immediately."""
+    question = interviewer_turn_task(ctx, job_title, job_description, resume_text, conversation)
+    ctx.report(progress=0.8, message="Preparing audio...")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    audio_file = os.path.join(ctx.scratch_dir, f"temp_audio_{timestamp}.mp3")
+    try:
+        synthesize_with_gtts(question, audio_file)
+    except Exception:
+        # Playback falls back to synthesizing on the fly
+        audio_file = None
+    if ctx.cancelled:
+        # A discarded speculative turn must not leave its audio behind
+        discard_turn_audio({"audio_file": audio_file})
+        ctx.check_cancelled()
+    return {"question": question, "audio_file": audio_file}
+
+def discard_turn_audio(turn):
+    if turn and turn.get("audio_file") and os.path.exists(turn["audio_file"]):
+        os.remove(turn["audio_file"])
+
+def record_answer_task(ctx, calibration, trailing_silence_ms):
+    # Calibrate the microphone once per interview and reuse it for every answer
+    if calibration is None:
+        ctx.report(message="Calibrating microphone, stay quiet...")
+        calibration = calibrate_microphone()
+
+    ctx.report(progress=0.1, message="Recording... Speak now!")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    audio_file = os.path.join(ctx.scratch_dir, f"temp_recording_{timestamp}.mp3")
+    try:
+        recorded = record_audio(
+            audio_file,
+            timeout=30,
+            phrase_time_limit=120,
+            calibration=calibration,
+            trailing_silence_ms=trailing_silence_ms
+        )
+        ctx.report(progress=0.7, message="Transcribing...")
+        transcript = transcribe_with_groq(audio_file) if recorded else ""
+    finally:
+        if os.path.exists(audio_file):
+            os.remove(audio_file)
+    return {"calibration": calibration, "transcript": transcript}
+
 def run_mock_interview(job, resume_path):
     """Run mock interview in the same app"""
     st.markdown("---")
@@ -113,10 +314,17 @@ def run_mock_interview(job, resume_path):
         st.session_state[f"{interview_key}_ended"] = False
     if f"{interview_key}_resume_text" not in st.session_state:
         st.session_state[f"{interview_key}_resume_text"] = ""
+    if f"{interview_key}_calibration" not in st.session_state:
+        st.session_state[f"{interview_key}_calibration"] = None
     
-    # Load resume
+    # Load only the resume sections relevant to this job
     if resume_path and not st.session_state[f"{interview_key}_resume_text"]:
-        st.session_state[f"{interview_key}_resume_text"] = read_resume_file(resume_path)
+        try:
+            st.session_state[f"{interview_key}_resume_text"] = relevant_resume_text(
+                resume_path, f"{job_title}\n{job_description}"
+            )
+        except Exception:
+            st.session_state[f"{interview_key}_resume_text"] = read_resume_file(resume_path)
     
     col1, col2 = st.columns([3, 1])
     
@@ -126,6 +334,9 @@ def run_mock_interview(job, resume_path):
     
     with col2:
         if st.button("🔄 Reset Interview", key=f"reset_{interview_key}"):
+            cancel_slot(f"{interview_key}_turn")
+            cancel_slot(f"{interview_key}_record")
+            st.session_state.speculator.discard(interview_key)
             st.session_state[f"{interview_key}_started"] = False
             st.session_state[f"{interview_key}_conversation"] = []
             st.session_state[f"{interview_key}_current_question"] = ""
@@ -133,6 +344,9 @@ def run_mock_interview(job, resume_path):
             st.rerun()
         
         if st.button("❌ Close Interview", key=f"close_{interview_key}"):
+            cancel_slot(f"{interview_key}_turn")
+            cancel_slot(f"{interview_key}_record")
+            st.session_state.speculator.discard(interview_key)
             # Clear all interview session state
             keys_to_remove = [key for key in st.session_state.keys() if interview_key in key]
             for key in keys_to_remove:
@@ -144,38 +358,44 @@ def run_mock_interview(job, resume_path):
         st.markdown("### 🚀 Ready to Start Your Mock Interview?")
         st.info("Click the button below to begin your AI-powered mock interview!")
         st.warning("⚠️ Make sure your camera and microphone are working and permissions are granted.")
+        if st.session_state.get(f"{interview_key}_error"):
+            st.error(f"Error starting interview: {st.session_state.pop(f'{interview_key}_error')}")
         
         if st.button("🎤 Start Interview", type="primary", key=f"start_{interview_key}"):
             st.session_state[f"{interview_key}_started"] = True
-            
-            with st.spinner("Preparing your interview..."):
-                try:
-                    vision_context = get_vision_context()
-                    
-                    interviewer_response = take_interview(
-                        job_title, 
-                        job_description, 
-                        st.session_state[f"{interview_key}_resume_text"],
-                        vision_context
-                    )
-                    
-                    question = sanitize_content(interviewer_response)
-                    st.session_state[f"{interview_key}_current_question"] = question
-                    st.session_state[f"{interview_key}_conversation"].append({
-                        "role": "interviewer",
-                        "content": question,
-                        "timestamp": datetime.now()
-                    })
-                    
-                    play_audio_async(question)
-                    st.success("✅ Interview started! Listen to the question and record your answer.")
-                    
-                except Exception as e:
-                    st.error(f"Error starting interview: {str(e)}")
-                    st.session_state[f"{interview_key}_started"] = False
+            submit_job(
+                f"{interview_key}_turn",
+                next_turn_task,
+                job_title,
+                job_description,
+                st.session_state[f"{interview_key}_resume_text"],
+                interactive=True
+            )
             st.rerun()
     
     else:
+        opening_job = None if st.session_state[f"{interview_key}_conversation"] else job_in_slot(f"{interview_key}_turn")
+        turn_job = collect_job(f"{interview_key}_turn", "🤔 Interviewer:")
+        if turn_job is not None:
+            response_content = turn_job.result["question"]
+
+            if "This concludes our interview" in response_content:
+                st.session_state[f"{interview_key}_ended"] = True
+
+            st.session_state[f"{interview_key}_current_question"] = response_content
+            st.session_state[f"{interview_key}_conversation"].append({
+                "role": "interviewer",
+                "content": response_content,
+                "timestamp": datetime.now()
+            })
+
+            play_audio_async(response_content, session_scratch_dir(), turn_job.result["audio_file"])
+        elif opening_job is not None and opening_job.finished:
+            # The opening question failed or was cancelled, go back to the start screen
+            st.session_state[f"{interview_key}_started"] = False
+            st.session_state[f"{interview_key}_error"] = opening_job.error or "Interview start was cancelled."
+            st.rerun()
+
         if not st.session_state[f"{interview_key}_ended"]:
             st.markdown("### 🎯 Interview in Progress")
             
@@ -184,80 +404,88 @@ def run_mock_interview(job, resume_path):
                 st.markdown("#### 🤖 Interviewer:")
                 st.info(st.session_state[f"{interview_key}_current_question"])
             
+            trailing_silence_ms = st.slider(
+                "Pause that ends your answer (ms)", min_value=300, max_value=2000, value=700, step=100,
+                key=f"silence_{interview_key}"
+            )
+
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 if st.button("🎤 Record Answer", type="primary", key=f"record_{interview_key}"):
-                    with st.spinner("🎙️ Recording... Speak now!"):
-                        try:
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            audio_file = f"temp_recording_{timestamp}.mp3"
-                            
-                            record_audio(audio_file, timeout=30, phrase_time_limit=30)
-                            candidate_response = transcribe_with_groq(audio_file)
-                            
-                            if candidate_response:
-                                st.session_state[f"{interview_key}_conversation"].append({
-                                    "role": "candidate",
-                                    "content": candidate_response,
-                                    "timestamp": datetime.now()
-                                })
-                                
-                                st.success("✅ Response recorded!")
-                                st.write(f"**Your response:** {candidate_response}")
-                            else:
-                                st.warning("Could not transcribe your response. Please try again.")
-                            
-                            if os.path.exists(audio_file):
-                                os.remove(audio_file)
-                                
-                        except Exception as e:
-                            st.error(f"Recording error: {str(e)}")
+                    if slot_busy(f"{interview_key}_record"):
+                        # A second job would open the microphone twice
+                        st.info("Already recording.")
+                    else:
+                        submit_job(
+                            f"{interview_key}_record",
+                            record_answer_task,
+                            st.session_state[f"{interview_key}_calibration"],
+                            trailing_silence_ms,
+                            interactive=True
+                        )
+
+                record_job = collect_job(f"{interview_key}_record", "🎙️")
+                if record_job is not None:
+                    st.session_state[f"{interview_key}_calibration"] = record_job.result["calibration"]
+                    candidate_response = record_job.result["transcript"]
+
+                    if candidate_response:
+                        st.session_state[f"{interview_key}_conversation"].append({
+                            "role": "candidate",
+                            "content": candidate_response,
+                            "timestamp": datetime.now()
+                        })
+
+                        st.success("✅ Response recorded!")
+                        st.write(f"**Your response:** {candidate_response}")
+
+                        # Start on the next question right away so it is ready when asked for
+                        conversation = st.session_state[f"{interview_key}_conversation"]
+                        st.session_state.speculator.start(
+                            interview_key,
+                            conversation_fingerprint(job_title, job_description, st.session_state[f"{interview_key}_resume_text"], conversation),
+                            next_turn_task,
+                            job_title,
+                            job_description,
+                            st.session_state[f"{interview_key}_resume_text"],
+                            list(conversation),
+                            session_id=st.session_state.session_id
+                        )
+                    else:
+                        st.warning("Could not transcribe your response. Please try again.")
             
             with col2:
                 if st.button("⭐ Get Next Question", key=f"next_{interview_key}"):
                     conversation = st.session_state[f"{interview_key}_conversation"]
-                    if conversation and conversation[-1]["role"] == "candidate":
-                        
-                        with st.spinner("🤔 Generating next question..."):
-                            try:
-                                vision_context = get_vision_context()
-                                
-                                conversation_context = "\n".join([
-                                    f"{msg['role'].title()}: {msg['content']}" 
-                                    for msg in conversation[-3:]
-                                ])
-                                
-                                full_context = f"Previous conversation:\n{conversation_context}\n\nVision: {vision_context}"
-                                
-                                interviewer_response = take_interview(
-                                    job_title,
-                                    job_description,
-                                    st.session_state[f"{interview_key}_resume_text"],
-                                    full_context
-                                )
-                                
-                                response_content = sanitize_content(interviewer_response)
-                                
-                                if "This concludes our interview" in response_content:
-                                    st.session_state[f"{interview_key}_ended"] = True
-                                
-                                st.session_state[f"{interview_key}_current_question"] = response_content
-                                st.session_state[f"{interview_key}_conversation"].append({
-                                    "role": "interviewer",
-                                    "content": response_content,
-                                    "timestamp": datetime.now()
-                                })
-                                
-                                play_audio_async(response_content)
-                            except Exception as e:
-                                st.error(f"Error generating question: {str(e)}")
+                    if f"{interview_key}_turn" in st.session_state.jobs:
+                        st.info("The next question is already on its way.")
+                    elif conversation and conversation[-1]["role"] == "candidate":
+                        resume_text = st.session_state[f"{interview_key}_resume_text"]
+                        speculative_job = st.session_state.speculator.take(
+                            interview_key,
+                            conversation_fingerprint(job_title, job_description, resume_text, conversation)
+                        )
+                        if speculative_job is not None:
+                            # Usually already finished, so the question shows up on the next rerun
+                            st.session_state.jobs[f"{interview_key}_turn"] = speculative_job.id
+                        else:
+                            submit_job(
+                                f"{interview_key}_turn",
+                                next_turn_task,
+                                job_title,
+                                job_description,
+                                resume_text,
+                                list(conversation),
+                                interactive=True
+                            )
                         st.rerun()
                     else:
                         st.warning("Please record an answer first!")
             
             with col3:
                 if st.button("🛑 End Interview", key=f"end_{interview_key}"):
+                    st.session_state.speculator.discard(interview_key)
                     st.session_state[f"{interview_key}_ended"] = True
                     st.rerun()
         
@@ -282,11 +510,20 @@ st.title("📄 Job Listings with Resume Analysis")
 
 location = st.text_input("Enter job location", value="")
 job_post = st.text_input("Enter job keyword/title", value="")
+max_results = st.slider("Maximum jobs to fetch", min_value=5, max_value=100, value=30, step=5)
 
 resume_file = st.file_uploader("Upload your resume (.pdf, .docx, .txt)", type=["pdf", "docx", "txt"])
 
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "jobs" not in st.session_state:
+    st.session_state.jobs = {}
+if "speculator" not in st.session_state:
+    st.session_state.speculator = Speculator(job_queue, on_discard=discard_turn_audio)
 if "resume_path" not in st.session_state:
     st.session_state.resume_path = None
+if "resume_file_id" not in st.session_state:
+    st.session_state.resume_file_id = None
 if "job_listings" not in st.session_state:
     st.session_state.job_listings = []
 if "analysis_results" not in st.session_state:
@@ -295,27 +532,54 @@ if "generated_emails" not in st.session_state:
     st.session_state.generated_emails = {}
 if "active_interview" not in st.session_state:
     st.session_state.active_interview = None
+if "match_matrix" not in st.session_state:
+    st.session_state.match_matrix = None
+
+with st.sidebar.expander("🛠️ LLM output repair stats"):
+    st.json(get_repair_stats())
 
-if resume_file:
+with st.sidebar.expander("⏱️ Groq scheduler"):
+    st.json(scheduler.get_metrics())
+
+with st.sidebar.expander("🧵 Background jobs"):
+    st.json(job_queue.get_metrics())
+
+# Each session writes its uploads to its own scratch directory, and only when the upload changes
+resume_file_id = getattr(resume_file, "file_id", None) or (resume_file and (resume_file.name, resume_file.size))
+resume_missing = not (st.session_state.resume_path and os.path.exists(st.session_state.resume_path))
+# Idle scratch directories are pruned, so write the upload again if it is gone
+if resume_file and (resume_file_id != st.session_state.resume_file_id or resume_missing):
     file_ext = os.path.splitext(resume_file.name)[1].lower()
-    resume_path = "temp_resume" + file_ext
+    resume_path = os.path.join(session_scratch_dir(), "resume" + file_ext)
     with open(resume_path, "wb") as f:
         f.write(resume_file.getbuffer())
     st.session_state.resume_path = resume_path
+    st.session_state.resume_file_id = resume_file_id
 
 if st.button("🔍 Search Jobs"):
     if not location or not job_post:
         st.error("Please enter both location and job keyword to search jobs.")
     else:
-        with st.spinner("Searching for jobs..."):
-            job_listings = get_jobs_from_remoteok(location, job_post)
-            if not job_listings:
-                st.warning("No jobs found for your query.")
-            else:
-                st.session_state.job_listings = job_listings
-                st.session_state.analysis_results = {}
-                st.session_state.generated_emails = {}
-                st.success(f"Found {len(job_listings)} jobs!")
+        cancel_slot("search")
+        # Results for the previous listings would land on the new jobs with the same index
+        for idx in range(len(st.session_state.job_listings)):
+            cancel_slot(f"analyze_{idx}")
+            cancel_slot(f"email_{idx}")
+        cancel_slot("match_matrix")
+        submit_job("search", scrape_jobs_task, job_post, location, max_results, get_job_enricher())
+
+search_job = collect_job("search", "🔍 Searching for jobs...", render_partial=render_found_jobs)
+if search_job is not None:
+    job_listings = search_job.result
+    if not job_listings:
+        st.warning("No jobs found for your query.")
+    else:
+        st.session_state.job_listings = job_listings
+        st.session_state.analysis_results = {}
+        st.session_state.generated_emails = {}
+        st.session_state.match_matrix = None
+        st.session_state.active_interview = None
+        st.success(f"Found {len(job_listings)} jobs!")
 
 if st.session_state.job_listings:
     st.subheader(f"✅ Jobs found for '{job_post}' in '{location}':")
@@ -323,32 +587,41 @@ if st.session_state.job_listings:
     for idx, job in enumerate(st.session_state.job_listings):
         with st.container():
             st.markdown(f"### {job.get('title', 'N/A')} at {job.get('company', 'N/A')} ({job.get('location', 'N/A')})")
-            st.markdown(f"**Job Description:** {job.get('job_posting', 'N/A')}")
+            if job.get("description"):
+                st.markdown(f"[View posting]({job.get('link', '')})")
+                with st.expander("📃 Job Description"):
+                    st.text(job["description"])
+            else:
+                st.markdown(f"**Job Description:** {job.get('job_posting', 'N/A')}")
             col1, col2, col3 = st.columns(3)
 
             if col1.button("📊 Resume Analysis", key=f"analyze_{idx}"):
-                if not st.session_state.resume_path:
+                if slot_busy(f"analyze_{idx}"):
+                    st.info("The analysis is already running.")
+                elif not st.session_state.resume_path:
                     st.error("Please upload your resume first.")
                 else:
-                    with st.spinner("Analyzing resume..."):
-                        result = analyze_resume_for_job(
-                            st.session_state.resume_path,
-                            job.get('job_posting', '')
-                        )
-                        st.session_state.analysis_results[idx] = result
+                    submit_job(f"analyze_{idx}", analyze_task, st.session_state.resume_path, job.get('job_posting', ''))
+
+            analysis_job = collect_job(f"analyze_{idx}", "📊 Analyzing resume...")
+            if analysis_job is not None:
+                st.session_state.analysis_results[idx] = analysis_job.result
 
             if idx in st.session_state.analysis_results:
                 st.markdown("#### Resume Analysis Result:")
                 st.json(st.session_state.analysis_results[idx])
 
             if col2.button("✉️ Generate Cold Email", key=f"email_{idx}"):
-                if not st.session_state.resume_path:
+                if slot_busy(f"email_{idx}"):
+                    st.info("The email is already being generated.")
+                elif not st.session_state.resume_path:
                     st.error("Please upload your resume first.")
                 else:
-                    with st.spinner("Generating cold email..."):
-                        resume_text = read_resume_text(st.session_state.resume_path)
-                        email_text = generate_email_for_job(job, resume_text)
-                        st.session_state.generated_emails[idx] = email_text
+                    submit_job(f"email_{idx}", email_task, st.session_state.resume_path, job)
+
+            email_job = collect_job(f"email_{idx}", "✉️ Generating cold email...")
+            if email_job is not None:
+                st.session_state.generated_emails[idx] = email_job.result
 
             if idx in st.session_state.generated_emails:
                 st.markdown("#### Generated Cold Email:")
@@ -363,10 +636,61 @@ if st.session_state.job_listings:
 
             st.markdown("---")
     
+    # Compare several resume variants against all listings
+    st.subheader("📑 Compare Resume Variants")
+    variant_files = st.file_uploader(
+        "Upload resume variants (.pdf, .docx, .txt)",
+        type=["pdf", "docx", "txt"],
+        accept_multiple_files=True,
+        key="resume_variants"
+    )
+    top_k = st.number_input("LLM-refined resumes per job", min_value=1, max_value=5, value=2)
+
+    if st.button("🧮 Build Match Matrix"):
+        if slot_busy("match_matrix"):
+            # Writing new variant files now would change what the running job reads
+            st.info("The match matrix is already being built.")
+        elif not variant_files:
+            st.error("Please upload at least one resume variant.")
+        else:
+            variant_paths = {}
+            for i, variant in enumerate(variant_files):
+                variant_path = os.path.join(
+                    session_scratch_dir(), f"resume_variant_{i}{os.path.splitext(variant.name)[1].lower()}"
+                )
+                with open(variant_path, "wb") as f:
+                    f.write(variant.getbuffer())
+                variant_paths[variant.name] = variant_path
+            submit_job("match_matrix", match_matrix_task, variant_paths, list(st.session_state.job_listings), int(top_k))
+
+    matrix_job = collect_job("match_matrix", "🧮 Building match matrix...")
+    if matrix_job is not None:
+        st.session_state.match_matrix = matrix_job.result
+
+    matrix = st.session_state.match_matrix
+    if matrix and matrix["similarity"].shape[1] == len(st.session_state.job_listings):
+        job_labels = [f"{j + 1}. {job.get('title', 'N/A')} @ {job.get('company', 'N/A')}" for j, job in enumerate(st.session_state.job_listings)]
+        scores = pd.DataFrame(matrix["llm_scores"], index=matrix["resume_names"], columns=job_labels)
+        st.markdown("#### LLM match % (top resumes per job)")
+        st.dataframe(scores)
+        st.markdown("#### Local similarity")
+        st.dataframe(pd.DataFrame(matrix["similarity"] * 100, index=matrix["resume_names"], columns=job_labels).round(1))
+        st.markdown("#### Best resume per job")
+        st.table(pd.DataFrame({
+            "Job": job_labels,
+            "Best resume": [matrix["resume_names"][i] for i in matrix["best_resume"]]
+        }))
+    st.markdown("---")
+
     # Display active interview
     if st.session_state.active_interview is not None:
         active_job = st.session_state.job_listings[st.session_state.active_interview]
         run_mock_interview(active_job, st.session_state.resume_path)
 
 else:
-    st.info("Search for jobs to see listings here.")
\ No newline at end of file
+    st.info("Search for jobs to see listings here.")
+
+# Keep polling while this session has background jobs in flight
+if jobs_running():
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
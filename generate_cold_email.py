@@ -1,21 +1,33 @@
-import streamlit as st
+import re
 import pandas as pd
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from groq_scheduler import ScheduledChatGroq, BATCH
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_community.document_loaders import WebBaseLoader
+from structured_output import parse_structured_output
+from resume_index import ResumeIndex
+from portfolio_store import portfolio_store
 
 load_dotenv()
 
-llm = ChatGroq(model_name="llama-3.3-70b-versatile")
-parser = JsonOutputParser()
+llm = ScheduledChatGroq(model_name="llama-3.3-70b-versatile", priority=BATCH)
 
-@st.cache_resource
 def load_portfolio_df():
-    csv_path = r"C:\Users\sahai\OneDrive\Desktop\GenAI proj\cold-email generator\my_portfolio.csv"
-    df = pd.read_csv(csv_path, encoding='utf-8')
-    return df
+    # Location comes from PORTFOLIO_CSV; the store reloads by itself when the CSV changes
+    return portfolio_store.load()
+
+def as_job_list(value):
+    """Accept a list of jobs, a single job dict or a dict wrapping the list."""
+    if isinstance(value, dict):
+        # e.g. {"jobs": [...], "count": 3}: unwrap the single list of job objects
+        job_lists = [
+            v for v in value.values()
+            if isinstance(v, list) and v and all(isinstance(job, dict) for job in v)
+        ]
+        value = job_lists[0] if len(job_lists) == 1 else [value]
+    if not isinstance(value, list) or not all(isinstance(job, dict) for job in value):
+        raise ValueError("Expected a list of job objects")
+    return value
 
 def extract_jobs_from_url(url):
     loader = WebBaseLoader(url)
@@ -34,21 +46,31 @@ def extract_jobs_from_url(url):
 
     chain_extract = prompt_extract | llm
     res = chain_extract.invoke({"page_data": page_data})
-    jobs = parser.parse(res.content)
+    jobs = parse_structured_output(
+        res.content,
+        as_job_list,
+        llm=llm,
+        format_instructions="Return a JSON list of objects with the keys `role`, `experience`, `skills` and `description`."
+    )
     return jobs  
 
 def find_relevant_links(skills, portfolio_df, max_links=2):
     skills_lower = [skill.lower() for skill in skills] if isinstance(skills, list) else [skills.lower()]
-    matched = portfolio_df[
-        portfolio_df["Techstack"].str.lower().apply(
-            lambda tech: any(skill in tech for skill in skills_lower)
-        )
-    ]
+    if "_techstack_lower" in portfolio_df:
+        techstack = portfolio_df["_techstack_lower"]
+    else:
+        techstack = portfolio_df["Techstack"].fillna("").astype(str).str.lower()
+    # One vectorized substring scan for all skills instead of a Python lambda per row
+    pattern = "|".join(re.escape(skill) for skill in skills_lower if skill)
+    if not pattern:
+        return []
+    matched = portfolio_df[techstack.str.contains(pattern, regex=True)]
     links = matched["Links"].head(max_links).tolist()
     return links
 
-def generate_email_for_job(job, resume_text, portfolio_df):
+def generate_email_for_job(job, resume_text, portfolio_df, resume_token_budget=1200):
     relevant_links = find_relevant_links(job['skills'], portfolio_df)
+    resume_text = ResumeIndex(resume_text).relevant_text(str(job), max_tokens=resume_token_budget)
 
     prompt_email = PromptTemplate.from_template("""
         ### JOB DESCRIPTION:
@@ -0,0 +1,247 @@
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from langchain_groq import ChatGroq
+
+from resume_index import estimate_tokens
+
+# Priority classes, lower runs first
+INTERACTIVE = 0
+DEFAULT = 1
+BATCH = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", DEFAULT: "default", BATCH: "batch"}
+
+logger = logging.getLogger(__name__)
+
+# (requests per minute, tokens per minute) per model; None means no token limit.
+# These are Groq free-tier values; paid deployments override them with GROQ_RATE_LIMITS.
+DEFAULT_LIMITS = {
+    "llama-3.3-70b-versatile": (30, 12000),
+    "meta-llama/llama-4-maverick-17b-128e-instruct": (30, 6000),
+    "whisper-large-v3": (20, None),
+}
+FALLBACK_LIMITS = (30, 6000)
+
+# Tokens reserved for the completion when estimating a chat call up front
+EXPECTED_COMPLETION_TOKENS = 512
+
+
+def limits_from_env(env_var="GROQ_RATE_LIMITS"):
+    """
+    Default limits updated from a JSON object in `env_var`, e.g.
+    {"llama-3.3-70b-versatile": [1000, 300000], "*": [100, 50000]}.
+    The "*" entry replaces the fallback used for models not listed.
+    """
+    limits = dict(DEFAULT_LIMITS)
+    raw = os.environ.get(env_var)
+    if not raw:
+        return limits
+    try:
+        overrides = json.loads(raw)
+        for model, (requests_per_minute, tokens_per_minute) in overrides.items():
+            limits[model] = (requests_per_minute, tokens_per_minute)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Ignoring invalid {env_var}: {e}")
+        return dict(DEFAULT_LIMITS)
+    return limits
+
+
+_current_priority = contextvars.ContextVar("groq_priority", default=None)
+
+
+@contextmanager
+def priority_scope(priority):
+    """Run every Groq call made inside the block (including LangChain batch workers) at `priority`."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def consume(self, amount):
+        self._refill()
+        self.level -= amount
+
+    def refund(self, amount):
+        """Give back (or, with a negative amount, charge extra) once real usage is known."""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _ModelLane:
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.queue = []
+
+
+class GroqScheduler:
+    """
+    Orders Groq calls by priority class and paces them with per-model request
+    and token buckets, so interactive interview turns are never stuck behind
+    batch analyses. Calls run on the caller's thread once admitted.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(limits_from_env() if limits is None else limits)
+        self._cond = threading.Condition()
+        self._lanes = {}
+        self._seq = itertools.count()
+        self._waits = {p: {"count": 0, "total": 0.0, "max": 0.0} for p in PRIORITY_NAMES}
+
+    def configure(self, model, requests_per_minute, tokens_per_minute=None):
+        with self._cond:
+            self.limits[model] = (requests_per_minute, tokens_per_minute)
+            self._lanes.pop(model, None)
+
+    def _lane(self, model) -> _ModelLane:
+        if model not in self._lanes:
+            fallback = self.limits.get("*", FALLBACK_LIMITS)
+            self._lanes[model] = _ModelLane(*self.limits.get(model, fallback))
+        return self._lanes[model]
+
+    def _acquire(self, model, priority, tokens):
+        enqueued = time.monotonic()
+        with self._cond:
+            lane = self._lane(model)
+            entry = (priority, next(self._seq))
+            heapq.heappush(lane.queue, entry)
+            self._cond.notify_all()
+            admitted = False
+            try:
+                while True:
+                    if lane.queue[0] == entry:
+                        delay = lane.requests.time_until(1)
+                        if lane.tokens is not None:
+                            delay = max(delay, lane.tokens.time_until(tokens))
+                        if delay <= 0:
+                            lane.requests.consume(1)
+                            if lane.tokens is not None:
+                                lane.tokens.consume(tokens)
+                            admitted = True
+                            self._record_wait(priority, time.monotonic() - enqueued)
+                            return
+                        self._cond.wait(timeout=delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                # Always leave the queue, also on errors (e.g. KeyboardInterrupt while
+                # waiting), or the stale entry would block this model forever
+                if admitted and lane.queue and lane.queue[0] == entry:
+                    heapq.heappop(lane.queue)
+                elif entry in lane.queue:
+                    lane.queue.remove(entry)
+                    heapq.heapify(lane.queue)
+                self._cond.notify_all()
+
+    def _record_wait(self, priority, waited):
+        stats = self._waits.setdefault(priority, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += waited
+        stats["max"] = max(stats["max"], waited)
+
+    def _settle(self, model, estimated, actual):
+        with self._cond:
+            lane = self._lane(model)
+            if lane.tokens is not None:
+                lane.tokens.refund(estimated - actual)
+            self._cond.notify_all()
+
+    def run(self, fn, model, priority=None, tokens=0, usage=None):
+        """
+        Wait for `model`'s budget in priority order, then call `fn()`.
+
+        Args:
+        fn (callable): The actual API call.
+        model (str): Groq model name, selects the rate limits.
+        priority (int): INTERACTIVE, DEFAULT or BATCH. Falls back to the current priority_scope.
+        tokens (int): Estimated total tokens (prompt + completion) for the call.
+        usage (callable): Optional, extracts the real token count from the result
+            so the bucket can be corrected.
+        """
+        if priority is None:
+            priority = _current_priority.get()
+        if priority is None:
+            priority = DEFAULT
+        self._acquire(model, priority, tokens)
+        result = fn()
+        if usage is not None:
+            try:
+                actual = usage(result)
+            except Exception:
+                actual = None
+            if actual:
+                self._settle(model, tokens, actual)
+        return result
+
+    def get_metrics(self):
+        """Current queue depth and wait-time statistics per priority class."""
+        with self._cond:
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for lane in self._lanes.values():
+                for priority, _ in lane.queue:
+                    depth[PRIORITY_NAMES.get(priority, str(priority))] += 1
+            waits = {}
+            for priority, stats in self._waits.items():
+                waits[PRIORITY_NAMES.get(priority, str(priority))] = {
+                    "count": stats["count"],
+                    "avg_wait_s": stats["total"] / stats["count"] if stats["count"] else 0.0,
+                    "max_wait_s": stats["max"],
+                }
+            return {"queue_depth": depth, "wait": waits}
+
+
+scheduler = GroqScheduler()
+
+
+def estimate_message_tokens(messages) -> int:
+    text = "".join(str(getattr(m, "content", m)) for m in messages)
+    return estimate_tokens(text)
+
+
+class ScheduledChatGroq(ChatGroq):
+    """ChatGroq whose requests go through the shared GroqScheduler."""
+
+    priority: Optional[int] = None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super(ScheduledChatGroq, self)._generate
+        priority = _current_priority.get()
+        if priority is None:
+            priority = self.priority
+        estimated = estimate_message_tokens(messages) + (self.max_tokens or EXPECTED_COMPLETION_TOKENS)
+        return scheduler.run(
+            lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            model=self.model_name,
+            priority=priority,
+            tokens=estimated,
+            usage=lambda result: (result.llm_output or {}).get("token_usage", {}).get("total_tokens"),
+        )
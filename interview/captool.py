@@ -24,6 +24,11 @@ def capture_image()->str:
     
     
 from groq import Groq
+from groq_scheduler import scheduler, INTERACTIVE
+from resume_index import estimate_tokens
+
+# Rough token cost of one webcam frame for the vision model
+IMAGE_TOKENS = 1000
     
 def analyze_image_with_query(query: str)-> str:
     """expects a string with query . captures image and sends the image and query to groq vision model."""
@@ -47,9 +52,12 @@ def analyze_image_with_query(query: str)-> str:
                     },
                 ],
             }]
-        chat_completion=client.chat.completions.create(
-        messages=messages,
-        model=model
+        chat_completion=scheduler.run(
+            lambda: client.chat.completions.create(messages=messages, model=model),
+            model=model,
+            priority=INTERACTIVE,
+            tokens=estimate_tokens(query) + IMAGE_TOKENS,
+            usage=lambda completion: completion.usage.total_tokens
         )
         return chat_completion.choices[0].message.content
     else:
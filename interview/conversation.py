@@ -1,9 +1,10 @@
 from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
+from groq_scheduler import ScheduledChatGroq, INTERACTIVE
 from dotenv import load_dotenv
 
 load_dotenv()
-llm = ChatGroq(model_name="llama-3.3-70b-versatile")
+# Interview turns are live, so they always go ahead of batch work
+llm = ScheduledChatGroq(model_name="llama-3.3-70b-versatile", priority=INTERACTIVE)
 
 def take_interview(post: str, job_description: str, resume_text: str, vision_context: str):
     template = """
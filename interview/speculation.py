@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+
+from task_queue import DONE, FAILED, CANCELLED
+
+logger = logging.getLogger(__name__)
+
+
+def conversation_fingerprint(job_title, job_description, resume_text, conversation) -> str:
+    """Identifies everything the next interviewer turn depends on."""
+    key = json.dumps({
+        "job_title": job_title,
+        "job_description": job_description,
+        "resume_text": resume_text,
+        "conversation": [(msg["role"], msg["content"]) for msg in conversation],
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class Speculator:
+    """
+    Keeps at most one speculative interviewer turn per interview.
+
+    A turn is started as soon as the candidate's transcript is available, and
+    is only handed out if the conversation still has the same fingerprint when
+    the next question is requested; otherwise it is cancelled and discarded.
+    """
+
+    def __init__(self, job_queue, on_discard=None):
+        self.job_queue = job_queue
+        self.on_discard = on_discard  # called with the result of every completed turn that is thrown away
+        self._pending = {}  # interview key -> (fingerprint, job id)
+
+    def start(self, key, fingerprint, fn, *args, session_id="shared", **kwargs):
+        current = self._pending.get(key)
+        if current is not None and current[0] == fingerprint:
+            job = self.job_queue.get(current[1])
+            if job is not None:
+                return job
+        self.discard(key)
+        job = self.job_queue.submit(
+            fn, *args, name=f"{key}_speculative", session_id=session_id, interactive=True, **kwargs
+        )
+        self._pending[key] = (fingerprint, job.id)
+        return job
+
+    def take(self, key, fingerprint):
+        """The speculative job for `fingerprint` (running or finished), or None if there is no usable one."""
+        current = self._pending.pop(key, None)
+        if current is None:
+            return None
+        job = self.job_queue.get(current[1])
+        if job is None:
+            return None
+        if current[0] != fingerprint or job.status in (FAILED, CANCELLED):
+            self._drop(job)
+            return None
+        return job
+
+    def discard(self, key):
+        current = self._pending.pop(key, None)
+        if current is not None:
+            job = self.job_queue.get(current[1])
+            if job is not None:
+                self._drop(job)
+
+    def _drop(self, job):
+        job.cancel()
+        if self.on_discard is not None:
+            # A running turn may still complete despite the cancel; clean up its result when it does
+            job.add_done_callback(self._discard_result)
+
+    def _discard_result(self, job):
+        if job.status == DONE:
+            try:
+                self.on_discard(job.result)
+            except Exception:
+                logger.exception(f"Could not discard the result of {job.name}")
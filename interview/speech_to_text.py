@@ -1,56 +1,116 @@
 import logging
 import speech_recognition as sr
 from pydub import AudioSegment
-from io import BytesIO
+from interview.vad import FRAME_MS, EnergyVAD, calibrate, capture_utterance, wav_frames, wav_params
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def record_audio(file_path, timeout=20, phrase_time_limit=None):
+SAMPLE_RATE = 16000
+
+
+def microphone_frames(source, frame_ms=FRAME_MS):
+    """Yield fixed-size PCM frames from an open sr.Microphone."""
+    frame_samples = source.SAMPLE_RATE * frame_ms // 1000
+    while True:
+        yield source.stream.read(frame_samples)
+
+
+def calibrate_microphone(duration=1.0):
+    """
+    Measure ambient noise once. Pass the result to record_audio for every
+    answer in the session instead of re-calibrating each time.
+    """
+    with sr.Microphone(sample_rate=SAMPLE_RATE) as source:
+        logging.info("Adjusting for ambient noise...")
+        frames = microphone_frames(source)
+        noise = [next(frames) for _ in range(int(duration * 1000 / FRAME_MS))]
+        calibration = calibrate(noise, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+    logging.info(f"Calibrated microphone: {calibration}")
+    return calibration
+
+
+def save_pcm_as_mp3(pcm_data, file_path, sample_rate, sample_width=2):
+    audio_segment = AudioSegment(data=pcm_data, sample_width=sample_width, frame_rate=sample_rate, channels=1)
+    audio_segment.export(file_path, format="mp3", bitrate="128k")
+
+
+def record_audio(file_path, timeout=20, phrase_time_limit=None, calibration=None, trailing_silence_ms=700):
     """
     Function to record audio from the microphone and save it as an MP3 file.
+    Recording stops once the speaker has been silent for `trailing_silence_ms`.
 
     Args:
     file_path (str): Path to save the recorded audio file.
     timeout (int): Maximum time to wait for a phrase to start (in seconds).
-    phrase_time_lfimit (int): Maximum time for the phrase to be recorded (in seconds).
+    phrase_time_limit (int): Maximum time for the phrase to be recorded (in seconds).
+    calibration (Calibration): Result of calibrate_microphone, measured now if None.
+    trailing_silence_ms (int): Silence that ends the recording (in milliseconds).
+
+    Returns True if speech was recorded and saved.
     """
-    recognizer = sr.Recognizer()
-    
     try:
-        with sr.Microphone() as source:
-            logging.info("Adjusting for ambient noise...")
-            recognizer.adjust_for_ambient_noise(source, duration=1)
+        if calibration is None:
+            calibration = calibrate_microphone()
+
+        with sr.Microphone(sample_rate=calibration.sample_rate) as source:
             logging.info("Start speaking now...")
-            
-            # Record the audio
-            audio_data = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-            logging.info("Recording complete.")
-            
-            # Convert the recorded audio to an MP3 file
-            wav_data = audio_data.get_wav_data()
-            audio_segment = AudioSegment.from_wav(BytesIO(wav_data))
-            audio_segment.export(file_path, format="mp3", bitrate="128k")
-            
-            logging.info(f"Audio saved to {file_path}")
+            pcm_data = capture_utterance(
+                microphone_frames(source),
+                EnergyVAD(calibration),
+                trailing_silence_ms=trailing_silence_ms,
+                start_timeout=timeout,
+                max_duration=phrase_time_limit
+            )
+
+        if pcm_data is None:
+            logging.info("No speech detected.")
+            return False
+        logging.info("Recording complete.")
+
+        # Convert the recorded audio to an MP3 file
+        save_pcm_as_mp3(pcm_data, file_path, calibration.sample_rate, calibration.sample_width)
+        logging.info(f"Audio saved to {file_path}")
+        return True
 
     except Exception as e:
         logging.error(f"An error occurred: {e}")
+        return False
+
+
+def record_from_wav(wav_path, calibration_ms=500, trailing_silence_ms=700):
+    """
+    Run the same endpointing as record_audio on a WAV file instead of the
+    microphone; the first `calibration_ms` of the file are used as background noise.
+
+    Returns the captured PCM data (same format as the WAV), or None if no speech was found.
+    Use save_pcm_as_mp3 to store it.
+    """
+    sample_rate, sample_width = wav_params(wav_path)
+    frames = wav_frames(wav_path)
+    noise = [frame for _, frame in zip(range(calibration_ms // FRAME_MS), frames)]
+    calibration = calibrate(noise, sample_rate, sample_width)
+    return capture_utterance(frames, EnergyVAD(calibration), trailing_silence_ms=trailing_silence_ms)
 
 
 
 import os
 from groq import Groq
+from groq_scheduler import scheduler, INTERACTIVE
 
 
 def transcribe_with_groq(audio_filepath):
     GROQ_API_KEY=os.environ.get("GROQ_API_KEY")
     client=Groq(api_key=GROQ_API_KEY)
     stt_model="whisper-large-v3"
-    audio_file=open(audio_filepath, "rb")
-    transcription=client.audio.transcriptions.create(
-        model=stt_model,
-        file=audio_file,
-        language="en"
-    )
+    with open(audio_filepath, "rb") as audio_file:
+        transcription=scheduler.run(
+            lambda: client.audio.transcriptions.create(
+                model=stt_model,
+                file=audio_file,
+                language="en"
+            ),
+            model=stt_model,
+            priority=INTERACTIVE
+        )
 
     return transcription.text
\ No newline at end of file
@@ -32,7 +32,8 @@ def text_to_speech_with_elevenlabs(input_text, output_filepath):
 
 from gtts import gTTS
 
-def text_to_speech_with_gtts(input_text, output_filepath):
+def synthesize_with_gtts(input_text, output_filepath):
+    """Only write the speech to `output_filepath`, so it can be played later without waiting on gTTS."""
     language="en"
 
     audioobj= gTTS(
@@ -41,6 +42,9 @@ def text_to_speech_with_gtts(input_text, output_filepath):
         slow=False
     )
     audioobj.save(output_filepath)
+
+
+def play_audio_file(output_filepath):
     os_name = platform.system()
     try:
         if os_name == "Darwin":  # macOS
@@ -52,4 +56,9 @@ def text_to_speech_with_gtts(input_text, output_filepath):
         else:
             raise OSError("Unsupported operating system")
     except Exception as e:
-        print(f"An error occurred while trying to play the audio: {e}")
\ No newline at end of file
+        print(f"An error occurred while trying to play the audio: {e}")
+
+
+def text_to_speech_with_gtts(input_text, output_filepath):
+    synthesize_with_gtts(input_text, output_filepath)
+    play_audio_file(output_filepath)
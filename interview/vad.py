@@ -0,0 +1,143 @@
+import wave
+
+import numpy as np
+
+FRAME_MS = 30
+
+
+class Calibration:
+    """Ambient noise level measured once per session and reused for every recording."""
+
+    def __init__(self, noise_floor: float, sample_rate: int, sample_width: int = 2):
+        self.noise_floor = noise_floor
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+    def __repr__(self):
+        return f"Calibration(noise_floor={self.noise_floor:.1f}, sample_rate={self.sample_rate})"
+
+
+def frame_energy(frame: bytes, sample_width: int = 2) -> float:
+    """RMS energy of a little-endian PCM frame."""
+    if sample_width == 1:
+        # 8-bit WAV samples are unsigned, centred on 128
+        samples = np.frombuffer(frame, dtype=np.uint8).astype(np.float64) - 128.0
+    else:
+        dtype = {2: np.int16, 4: np.int32}[sample_width]
+        samples = np.frombuffer(frame, dtype=dtype).astype(np.float64)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+def calibrate(frames, sample_rate: int, sample_width: int = 2) -> Calibration:
+    """Build a Calibration from frames of background noise (no speech)."""
+    energies = [frame_energy(frame, sample_width) for frame in frames]
+    # Median is robust to a cough or a click during calibration
+    noise_floor = float(np.median(energies)) if energies else 0.0
+    return Calibration(noise_floor, sample_rate, sample_width)
+
+
+class EnergyVAD:
+    """
+    Streaming energy-based voice activity detector.
+
+    A frame counts as speech when its energy is `threshold_ratio` times the
+    noise floor (and above `min_threshold`). The floor keeps adapting slowly
+    during silence so it follows changes in background noise.
+
+    `min_threshold` is given in 16-bit sample units and scaled to the
+    calibration's sample width (8-bit RMS never exceeds 128).
+    """
+
+    def __init__(self, calibration: Calibration, threshold_ratio=3.0, min_threshold=300.0, adapt_rate=0.05):
+        self.noise_floor = calibration.noise_floor
+        self.sample_width = calibration.sample_width
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold * 256.0 ** (calibration.sample_width - 2)
+        self.adapt_rate = adapt_rate
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_threshold, self.noise_floor * self.threshold_ratio)
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy = frame_energy(frame, self.sample_width)
+        if energy >= self.threshold:
+            return True
+        self.noise_floor += self.adapt_rate * (energy - self.noise_floor)
+        return False
+
+
+def capture_utterance(frames, vad: EnergyVAD, frame_ms=FRAME_MS, trailing_silence_ms=700,
+                      start_timeout=20, max_duration=None, pre_roll_ms=300, min_speech_ms=150):
+    """
+    Consume PCM frames until the speaker has finished and return the captured audio.
+
+    Capture starts at the first run of `min_speech_ms` of speech (keeping
+    `pre_roll_ms` before it so the first syllable isn't clipped) and ends after
+    `trailing_silence_ms` of silence. Returns None if nobody starts speaking
+    within `start_timeout` seconds.
+
+    Args:
+    frames (iterable): Raw PCM frames of `frame_ms` each, from a microphone or a WAV file.
+    vad (EnergyVAD): Voice activity detector.
+    trailing_silence_ms (int): Silence that marks the end of the answer.
+    start_timeout (float): Maximum time to wait for speech to start (in seconds).
+    max_duration (float): Maximum length of the answer (in seconds), None for no limit.
+    """
+    pre_roll_frames = max(1, pre_roll_ms // frame_ms)
+    min_speech_frames = max(1, min_speech_ms // frame_ms)
+    end_silence_frames = max(1, trailing_silence_ms // frame_ms)
+    start_timeout_frames = int(start_timeout * 1000 / frame_ms) if start_timeout else None
+    max_frames = int(max_duration * 1000 / frame_ms) if max_duration else None
+
+    pending, captured = [], []
+    speech_run, silence_run, waited = 0, 0, 0
+    started = False
+
+    for frame in frames:
+        speech = vad.is_speech(frame)
+        if not started:
+            waited += 1
+            pending.append(frame)
+            speech_run = speech_run + 1 if speech else 0
+            if speech_run >= min_speech_frames:
+                started = True
+                captured = pending[-(pre_roll_frames + speech_run):]
+                silence_run = 0
+            else:
+                pending = pending[-(pre_roll_frames + min_speech_frames):]
+                if start_timeout_frames is not None and waited >= start_timeout_frames:
+                    return None
+            continue
+
+        captured.append(frame)
+        silence_run = 0 if speech else silence_run + 1
+        if silence_run >= end_silence_frames:
+            # Keep a little of the trailing silence so the last word isn't clipped
+            keep = len(captured) - silence_run + min(silence_run, pre_roll_frames)
+            return b"".join(captured[:keep])
+        if max_frames is not None and len(captured) >= max_frames:
+            break
+
+    return b"".join(captured) if started else None
+
+
+def wav_frames(path: str, frame_ms=FRAME_MS):
+    """Yield PCM frames from a mono WAV file, e.g. a recorded test fixture."""
+    with wave.open(path, "rb") as wav:
+        if wav.getnchannels() != 1:
+            raise ValueError(f"{path} has {wav.getnchannels()} channels, expected mono")
+        frame_samples = wav.getframerate() * frame_ms // 1000
+        while True:
+            frame = wav.readframes(frame_samples)
+            if len(frame) < frame_samples * wav.getsampwidth():
+                break
+            yield frame
+
+
+def wav_params(path: str):
+    """(sample_rate, sample_width) of a WAV file."""
+    with wave.open(path, "rb") as wav:
+        return wav.getframerate(), wav.getsampwidth()
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from json_cache import JsonFileCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "job_descriptions.json")
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+}
+DESCRIPTION_SELECTORS = ['div.description', 'div.markdown', '[itemprop="description"]', 'article', 'main']
+MAX_DESCRIPTION_CHARS = 6000
+DEFAULT_MAX_WORKERS = int(os.environ.get("JOB_DETAILS_WORKERS", "6"))
+DEFAULT_MAX_PER_HOST = int(os.environ.get("JOB_DETAILS_PER_HOST", "4"))
+# Minimum time between the starts of two requests to the same host (in seconds)
+DEFAULT_HOST_INTERVAL = float(os.environ.get("JOB_DETAILS_HOST_INTERVAL", "0.5"))
+
+
+def extract_description(html: str) -> str:
+    """Pull the job description out of a job page (JSON-LD first, then common containers)."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting" and item.get("description"):
+                text = BeautifulSoup(item["description"], "html.parser").get_text("\n")
+                return _clean(text)
+
+    for selector in DESCRIPTION_SELECTORS:
+        node = soup.select_one(selector)
+        if node and node.get_text(strip=True):
+            return _clean(node.get_text("\n"))
+
+    return _clean(soup.get_text("\n"))
+
+
+def _clean(text: str) -> str:
+    lines = [line.strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)[:MAX_DESCRIPTION_CHARS]
+
+
+class DescriptionCache(JsonFileCache):
+    """URL -> description cache persisted as JSON, with ETag/Last-Modified validators."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=6 * 3600):
+        super().__init__(path)
+        self.ttl = ttl
+
+    def is_fresh(self, entry) -> bool:
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, url, description, etag=None, last_modified=None):
+        self.set(url, {
+            "description": description,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        })
+
+    def touch(self, url):
+        entry = self.get(url)
+        if entry is not None:
+            self.set(url, dict(entry, fetched_at=time.time()))
+
+
+# Shared by every enricher in the process
+description_cache = DescriptionCache()
+
+
+class HostLimiter:
+    """
+    Per-host politeness: at most `max_per_host` requests to the same host in
+    flight, and request starts spaced at least `min_interval` seconds apart.
+    """
+
+    def __init__(self, max_per_host=DEFAULT_MAX_PER_HOST, min_interval=DEFAULT_HOST_INTERVAL):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    @contextmanager
+    def limit(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            with self._lock:
+                # Reserve the next start slot for this host, then sleep until it comes
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class JobEnricher:
+    """
+    Fetches full job descriptions from each job's `link` on a bounded thread pool,
+    with at most `max_per_host` requests in flight to any one host and at least
+    `host_interval` seconds between their starts.
+
+    Jobs can be submitted while scraping is still running, so fetching overlaps
+    with scrolling. Descriptions are cached by URL and revalidated with
+    ETag/Last-Modified once the TTL expires.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_per_host=DEFAULT_MAX_PER_HOST,
+                 host_interval=DEFAULT_HOST_INTERVAL, timeout=15, cache=None):
+        self.timeout = timeout
+        self.cache = cache if cache is not None else description_cache
+        self.host_limiter = HostLimiter(max_per_host, host_interval)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-details")
+        self._local = threading.local()
+
+    @property
+    def _session(self):
+        # requests.Session is not thread-safe, so each worker thread gets its own
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            self._local.session = session
+        return session
+
+    def fetch_description(self, url: str) -> str:
+        entry = self.cache.get(url)
+        if self.cache.is_fresh(entry):
+            return entry["description"]
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with self.host_limiter.limit(url):
+            response = self._session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry:
+            self.cache.touch(url)
+            return entry["description"]
+        response.raise_for_status()
+
+        description = extract_description(response.text)
+        self.cache.put(
+            url,
+            description,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return description
+
+    def _enrich(self, job: dict) -> dict:
+        link = job.get("link")
+        if not link:
+            return job
+        try:
+            description = self.fetch_description(link)
+        except Exception as e:
+            logger.error(f"Could not fetch job details from {link}: {e}")
+            return job
+        if description:
+            job["description"] = description
+            job["job_posting"] = f"{job.get('title', '')} role at {job.get('company', '')} in {job.get('location', '')}.\n\n{description}"
+        return job
+
+    def submit(self, job: dict):
+        """Start fetching details for `job` (updated in place); returns a Future."""
+        return self._executor.submit(self._enrich, job)
+
+    def enrich_jobs(self, jobs):
+        """Enrich all `jobs` concurrently, yielding each one as soon as it is done."""
+        futures = [self.submit(job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+        self.cache.save()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.save()
+
+
+def enrich_jobs(jobs, max_workers=DEFAULT_MAX_WORKERS, max_per_host=DEFAULT_MAX_PER_HOST):
+    """Fetch full descriptions for `jobs` in place and return them."""
+    enricher = JobEnricher(max_workers=max_workers, max_per_host=max_per_host)
+    try:
+        for _ in enricher.enrich_jobs(jobs):
+            pass
+    finally:
+        enricher.close()
+    return jobs
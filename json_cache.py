@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Saves to the same file are serialized across cache instances
+_save_locks = {}
+_save_locks_guard = threading.Lock()
+
+
+def _save_lock(path):
+    with _save_locks_guard:
+        return _save_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class JsonFileCache:
+    """
+    Thread-safe dict of JSON-serializable entries, persisted to a single JSON file.
+
+    Share one instance per file where possible. Saving merges with what is on
+    disk, so entries written by other instances or processes are kept.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._read() if path else {}
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable cache {self.path}: {e}")
+            return {}
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+
+    def save(self):
+        """
+        Merge the entries into the file and replace it atomically; a no-op for
+        caches without a path. Errors are logged, since a cache is never worth
+        failing the work that filled it.
+        """
+        if not self.path:
+            return
+        tmp_path = None
+        try:
+            with _save_lock(self.path):
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                entries = self._read()
+                with self._lock:
+                    entries.update(self._entries)
+                    self._entries = dict(entries)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path), suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Could not save cache {self.path}: {e}")
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
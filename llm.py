@@ -1,5 +1,5 @@
-from langchain_groq import ChatGroq
+from groq_scheduler import ScheduledChatGroq
 from dotenv import load_dotenv
 load_dotenv()
 
-llm = ChatGroq(model_name="llama-3.3-70b-versatile")
+llm = ScheduledChatGroq(model_name="llama-3.3-70b-versatile")
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+from llm import llm
+from groq_scheduler import priority_scope, BATCH
+from match_resume import build_analysis_prompt, parse_analysis, RESUME_TOKEN_BUDGET
+from resume_index import ResumeIndex, tokenize
+from json_cache import JsonFileCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "match_results.json")
+
+
+def resume_fingerprint(resume_text: str) -> str:
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()[:16]
+
+
+def job_fingerprint(job: dict) -> str:
+    key = "\n".join([job.get("link", ""), job.get("title", ""), job.get("company", ""), job.get("job_posting", "")])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def similarity_matrix(resume_texts, job_texts) -> np.ndarray:
+    """Cosine similarity of TF-IDF vectors, shape (len(resume_texts), len(job_texts))."""
+    documents = [tokenize(text) for text in list(resume_texts) + list(job_texts)]
+    vocabulary = {}
+    for tokens in documents:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.zeros((len(resume_texts), len(job_texts)))
+
+    counts = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        columns = np.fromiter((vocabulary[t] for t in tokens), dtype=np.int64, count=len(tokens))
+        np.add.at(counts[row], columns, 1)
+
+    doc_freq = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(documents)) / (1 + doc_freq)) + 1
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1, norms)
+
+    resumes = weights[:len(resume_texts)]
+    jobs = weights[len(resume_texts):]
+    return resumes @ jobs.T
+
+
+class MatchCache(JsonFileCache):
+    """LLM analysis results keyed by (resume hash, job fingerprint), persisted as JSON."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        super().__init__(path)
+
+    def get(self, resume_hash, job_hash):
+        return super().get(f"{resume_hash}:{job_hash}")
+
+    def put(self, resume_hash, job_hash, result: dict):
+        self.set(f"{resume_hash}:{job_hash}", result)
+
+
+# Shared by every matrix job in the process
+match_cache = MatchCache()
+
+
+def build_match_matrix(resumes: dict, jobs: list, top_k=2, max_concurrency=4, cache=None):
+    """
+    Score every resume against every job.
+
+    A local TF-IDF pass fills the whole N x M matrix. Only the `top_k` resumes
+    per job are then sent to the LLM, concurrently and in one batch, and those
+    results are cached per (resume hash, job fingerprint).
+
+    Args:
+    resumes (dict): Resume name -> resume text.
+    jobs (list): Job dicts as returned by the scraper.
+    top_k (int): Number of best local matches per job to refine with the LLM.
+    max_concurrency (int): Maximum number of LLM calls in flight.
+    cache (MatchCache): Result cache, the shared `match_cache` if None.
+
+    Returns a dict with `resume_names`, `similarity` (N x M, 0-1),
+    `llm_scores` (N x M, NaN where not refined), `analyses` ({(i, j): result dict})
+    and `best_resume` (resume index per job).
+    """
+    cache = cache if cache is not None else match_cache
+    resume_names = list(resumes)
+    resume_texts = [resumes[name] for name in resume_names]
+    job_texts = [f"{job.get('title', '')}\n{job.get('job_posting', '')}" for job in jobs]
+
+    similarity = similarity_matrix(resume_texts, job_texts)
+    llm_scores = np.full(similarity.shape, np.nan)
+    analyses = {}
+
+    resume_hashes = [resume_fingerprint(text) for text in resume_texts]
+    job_hashes = [job_fingerprint(job) for job in jobs]
+    indexes = {}
+
+    pending, prompts = [], []
+    k = min(top_k, len(resume_names))
+    for j in range(len(jobs)):
+        for i in np.argsort(-similarity[:, j])[:k]:
+            i = int(i)
+            cached = cache.get(resume_hashes[i], job_hashes[j])
+            if cached is not None:
+                analyses[(i, j)] = cached
+                llm_scores[i, j] = cached["matching_percentage"]
+                continue
+            if i not in indexes:
+                indexes[i] = ResumeIndex(resume_texts[i])
+            resume_text = indexes[i].relevant_text(job_texts[j], max_tokens=RESUME_TOKEN_BUDGET)
+            pending.append((i, j))
+            prompts.append(build_analysis_prompt(resume_text, job_texts[j]))
+
+    if prompts:
+        with priority_scope(BATCH):
+            responses = llm.batch(prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for (i, j), response in zip(pending, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Analysis failed for {resume_names[i]} x job {j}: {response}")
+                continue
+            try:
+                with priority_scope(BATCH):
+                    result = parse_analysis(response.content).model_dump()
+            except Exception as e:
+                logger.error(f"Analysis failed for {resume_names[i]} x job {j}: {e}")
+                continue
+            cache.put(resume_hashes[i], job_hashes[j], result)
+            analyses[(i, j)] = result
+            llm_scores[i, j] = result["matching_percentage"]
+        cache.save()
+
+    # Refined cells always outrank unrefined ones; similarity only breaks ties among the rest
+    combined = np.where(np.isnan(llm_scores), similarity * 100 - 100, llm_scores)
+    best_resume = combined.argmax(axis=0).tolist() if resume_names else []
+
+    return {
+        "resume_names": resume_names,
+        "similarity": similarity,
+        "llm_scores": llm_scores,
+        "analyses": analyses,
+        "best_resume": best_resume,
+    }
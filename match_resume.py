@@ -2,8 +2,16 @@ from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, Te
 import os
 from llm import llm
 from langchain.prompts import PromptTemplate
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from langchain.output_parsers import PydanticOutputParser
+from structured_output import parse_structured_output
+from resume_index import ResumeIndex
+
+# Token budget for the resume part of each prompt
+RESUME_TOKEN_BUDGET = 1200
+
+# One index per resume path, replaced when the file changes
+_resume_indexes = {}
 
 def resume_analysis(path: str):
     ext = os.path.splitext(path)[1].lower()
@@ -19,10 +27,44 @@ def resume_analysis(path: str):
     documents = loader.load()
     return "\n".join([doc.page_content for doc in documents])
 
+def load_resume_index(path: str, embeddings=None) -> ResumeIndex:
+    """Load and index a resume, reusing the index until the file changes."""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    cached = _resume_indexes.get(path)
+    if cached is None or cached[0] != mtime or cached[1] is not embeddings:
+        cached = (mtime, embeddings, ResumeIndex(resume_analysis(path), embeddings=embeddings))
+        _resume_indexes[path] = cached
+    return cached[2]
+
+def relevant_resume_text(path: str, job_posting: str, max_tokens=RESUME_TOKEN_BUDGET, embeddings=None) -> str:
+    """Only the resume sections that best match `job_posting`, within `max_tokens`."""
+    return load_resume_index(path, embeddings=embeddings).relevant_text(job_posting, max_tokens=max_tokens)
+
 class ResumeAnalysisResult(BaseModel):
     matching_percentage: int
     suggestions: list[str]
 
+    @field_validator("matching_percentage", mode="before")
+    @classmethod
+    def coerce_percentage(cls, value):
+        # LLMs often answer "85%", "85.5" or 0.85 instead of a plain integer
+        if isinstance(value, str):
+            value = float(value.strip().rstrip("%").strip())
+        if isinstance(value, float):
+            value = value * 100 if 0 < value < 1 else value
+            value = round(value)
+        return max(0, min(100, value))
+
+    @field_validator("suggestions", mode="before")
+    @classmethod
+    def coerce_suggestions(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [line.strip(" -*\t") for line in value.splitlines() if line.strip(" -*\t")]
+        return [item if isinstance(item, str) else str(item) for item in value]
+
 py_parser = PydanticOutputParser(pydantic_object=ResumeAnalysisResult)
 
 template = """You are an expert career coach and resume reviewer.
@@ -52,19 +94,26 @@ ONLY respond with a valid JSON object in this exact format:
   ]
 }}"""
 
-def analyze_resume_for_job(resume_path, job_posting):
-    resume_text = resume_analysis(resume_path)
+def build_analysis_prompt(resume_text, job_posting):
     prompt_template = PromptTemplate(template=template, input_variables=['resume_text', 'job_posting'])
-    prompt = prompt_template.format(resume_text=resume_text, job_posting=job_posting)
+    return prompt_template.format(resume_text=resume_text, job_posting=job_posting)
+
+def parse_analysis(response_text):
+    # Repairs locally first and only asks the LLM to fix its own output as a last resort
+    return parse_structured_output(
+        response_text,
+        ResumeAnalysisResult.model_validate,
+        llm=llm,
+        format_instructions=py_parser.get_format_instructions()
+    )
+
+def analyze_resume_for_job(resume_path, job_posting):
+    resume_text = relevant_resume_text(resume_path, job_posting)
+    prompt = build_analysis_prompt(resume_text, job_posting)
 
     response = llm.invoke(prompt)
     response_text = response.content  # get raw LLM output text
 
-    try:
-        parsed = py_parser.parse(response_text)
-    except Exception as e:
-        print("Parsing error:", e)
-        print("Raw response was:", response_text)
-        raise e
+    parsed = parse_analysis(response_text)
 
     return parsed
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from io import BytesIO
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CSV_PATH = os.environ.get(
+    "PORTFOLIO_CSV", os.path.join(os.path.dirname(os.path.abspath(__file__)), "my_portfolio.csv")
+)
+# Defaults to a .cache directory next to the CSV, not the current working directory
+DEFAULT_CACHE_DIR = os.environ.get("PORTFOLIO_CACHE_DIR")
+
+# Bytes before the previous end of file that must be unchanged for an append-only reload
+TAIL_CHECK_BYTES = 4096
+
+
+class PortfolioStore:
+    """
+    Portfolio projects loaded from a CSV and kept in a Parquet cache (needs pyarrow).
+
+    The cache lives in `cache_dir` (by default `.cache` next to the CSV) and is
+    reused across processes until the CSV changes. Each `load()` only stats the
+    CSV; rows appended to the end are read incrementally, any other change
+    triggers a full reload. Works with or without Streamlit.
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, cache_dir=DEFAULT_CACHE_DIR):
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), ".cache")
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._df = None
+        self._meta = None
+        name = hashlib.sha256(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:12]
+        self.cache_path = os.path.join(cache_dir, f"portfolio_{name}.parquet") if cache_dir else None
+        self.meta_path = os.path.join(cache_dir, f"portfolio_{name}.json") if cache_dir else None
+
+    def load(self) -> pd.DataFrame:
+        """Current portfolio, reloading only what changed since the last call."""
+        with self._lock:
+            stat = os.stat(self.csv_path)
+            if self._meta is None:
+                self._load_cache()
+            if self._meta and self._meta["mtime"] == stat.st_mtime and self._meta["size"] == stat.st_size:
+                return self._df
+
+            if self._meta and stat.st_size > self._meta["size"] and self._tail_unchanged():
+                self._append_rows(stat)
+            else:
+                self._full_reload(stat)
+            self._save_cache()
+            return self._df
+
+    def _tail_checksum(self, end) -> str:
+        with open(self.csv_path, "rb") as f:
+            f.seek(max(0, end - TAIL_CHECK_BYTES))
+            return hashlib.sha256(f.read(min(end, TAIL_CHECK_BYTES))).hexdigest()
+
+    def _tail_unchanged(self) -> bool:
+        # A last line without a newline may have been edited rather than appended to
+        return self._meta.get("ends_with_newline") and self._tail_checksum(self._meta["size"]) == self._meta["tail"]
+
+    def _full_reload(self, stat):
+        logger.info(f"Loading portfolio from {self.csv_path}")
+        df = pd.read_csv(self.csv_path, encoding='utf-8')
+        self._df = self._prepare(df)
+        self._meta = self._snapshot(stat)
+
+    def _append_rows(self, stat):
+        with open(self.csv_path, "rb") as f:
+            f.seek(self._meta["size"])
+            new_bytes = f.read(stat.st_size - self._meta["size"])
+        if new_bytes.strip():
+            columns = [c for c in self._df.columns if not c.startswith("_")]
+            new_rows = pd.read_csv(BytesIO(new_bytes), encoding='utf-8', header=None, names=columns)
+            logger.info(f"Appending {len(new_rows)} new portfolio rows")
+            self._df = pd.concat([self._df, self._prepare(new_rows)], ignore_index=True)
+        self._meta = self._snapshot(stat)
+
+    @staticmethod
+    def _prepare(df) -> pd.DataFrame:
+        # Lower-cased tech stack is computed once here instead of on every lookup
+        df["_techstack_lower"] = df["Techstack"].fillna("").astype(str).str.lower()
+        return df
+
+    def _snapshot(self, stat) -> dict:
+        with open(self.csv_path, "rb") as f:
+            f.seek(max(0, stat.st_size - 1))
+            last_byte = f.read(1)
+        return {
+            "ends_with_newline": last_byte == b"\n",
+            "source": os.path.abspath(self.csv_path),
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "tail": self._tail_checksum(stat.st_size),
+        }
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path) or not os.path.exists(self.meta_path):
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            df = pd.read_parquet(self.cache_path)
+        except Exception as e:
+            logger.error(f"Ignoring unreadable portfolio cache {self.cache_path}: {e}")
+            return
+        self._df, self._meta = df, meta
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            self._df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.cache_path)
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump(self._meta, f)
+        except Exception as e:
+            logger.error(f"Could not write portfolio cache {self.cache_path}: {e}")
+
+
+portfolio_store = PortfolioStore()
@@ -0,0 +1,179 @@
+import math
+import re
+from collections import Counter
+
+SECTION_HEADINGS = {
+    "summary", "profile", "objective", "about", "about me",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "projects", "personal projects", "academic projects",
+    "skills", "technical skills", "core skills", "technologies",
+    "education", "certifications", "certificates", "courses",
+    "achievements", "awards", "publications", "leadership", "activities",
+    "volunteering", "volunteer experience", "languages", "interests", "internships",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "role", "job",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t.strip(".-") for t in _TOKEN_RE.findall(text.lower()) if t.strip(".-") not in _STOPWORDS]
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return False
+    if stripped.lower() in SECTION_HEADINGS:
+        return True
+    # Short all-caps lines like "WORK EXPERIENCE" are headings in most resume templates
+    return stripped.isupper() and len(stripped.split()) <= 4
+
+
+def split_resume(resume_text: str, max_chunk_tokens=200) -> list[dict]:
+    """
+    Split resume text into chunks that follow section headings. Sections are
+    broken on blank lines, and blocks longer than `max_chunk_tokens` are split
+    between lines, keeping the block's first line at the top of each piece.
+    """
+    sections, heading, lines = [], "header", []
+    for line in resume_text.splitlines():
+        if _is_heading(line):
+            if any(l.strip() for l in lines):
+                sections.append((heading, lines))
+            heading, lines = line.strip().rstrip(":"), []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        sections.append((heading, lines))
+
+    chunks = []
+    for heading, lines in sections:
+        # Blank-line separated blocks (one job, one project...) are the natural unit
+        blocks, block = [], []
+        for line in lines + [""]:
+            if line.strip():
+                block.append(line)
+            elif block:
+                blocks.append(block)
+                block = []
+        for block in blocks:
+            # The first line (company, title, project name) is repeated on every
+            # piece of a long block so no chunk loses its context
+            head, current = block[0], [block[0]]
+            for line in block[1:]:
+                if len(current) > 1 and estimate_tokens("\n".join(current + [line])) > max_chunk_tokens:
+                    chunks.append({"section": heading, "text": "\n".join(current)})
+                    current = [head]
+                current.append(line)
+            chunks.append({"section": heading, "text": "\n".join(current)})
+
+    for position, chunk in enumerate(chunks):
+        chunk["position"] = position
+        chunk["tokens"] = estimate_tokens(chunk["section"] + "\n" + chunk["text"])
+    return chunks
+
+
+class ResumeIndex:
+    """
+    Local BM25 index over resume chunks, with optional embedding scoring.
+
+    `embeddings` can be any LangChain embeddings object (anything with
+    `embed_documents` and `embed_query`); when given, its cosine similarity is
+    blended with the lexical score.
+    """
+
+    def __init__(self, resume_text: str, embeddings=None, max_chunk_tokens=200):
+        self.resume_text = resume_text
+        self.chunks = split_resume(resume_text, max_chunk_tokens=max_chunk_tokens)
+        self.embeddings = embeddings
+        self._chunk_terms = [Counter(tokenize(c["section"] + " " + c["text"])) for c in self.chunks]
+        self._avg_len = sum(sum(t.values()) for t in self._chunk_terms) / max(1, len(self.chunks))
+        doc_freq = Counter(term for terms in self._chunk_terms for term in terms)
+        n = len(self.chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+        self._chunk_vectors = None
+        if embeddings is not None and self.chunks:
+            self._chunk_vectors = embeddings.embed_documents([c["text"] for c in self.chunks])
+
+    @property
+    def total_tokens(self) -> int:
+        return estimate_tokens(self.resume_text)
+
+    def lexical_scores(self, query: str, k1=1.5, b=0.75) -> list[float]:
+        query_terms = set(tokenize(query))
+        scores = []
+        for terms in self._chunk_terms:
+            length = sum(terms.values())
+            score = 0.0
+            for term in query_terms:
+                tf = terms.get(term, 0)
+                if tf:
+                    norm = tf + k1 * (1 - b + b * length / (self._avg_len or 1))
+                    score += self._idf[term] * tf * (k1 + 1) / norm
+            scores.append(score)
+        return scores
+
+    def scores(self, query: str, embedding_weight=0.5) -> list[float]:
+        lexical = self.lexical_scores(query)
+        top = max(lexical, default=0) or 1
+        lexical = [s / top for s in lexical]
+        if self._chunk_vectors is None:
+            return lexical
+
+        query_vector = self.embeddings.embed_query(query)
+        semantic = [_cosine(query_vector, v) for v in self._chunk_vectors]
+        return [(1 - embedding_weight) * l + embedding_weight * s for l, s in zip(lexical, semantic)]
+
+    def top_chunks(self, query: str, max_tokens=1200, min_score=0.0) -> list[dict]:
+        """
+        Chunks that fit in `max_tokens`, returned in resume order. Chunks scoring
+        above `min_score` are picked first, best first; the budget left after that
+        is filled with the remaining chunks in resume order, so a poor lexical
+        match (e.g. a one-line job posting) still gets a full resume.
+        """
+        scored = list(zip(self.scores(query), self.chunks))
+        ranked = sorted((pair for pair in scored if pair[0] > min_score), key=lambda pair: -pair[0])
+        rest = [pair for pair in scored if pair[0] <= min_score]
+        selected, used = [], 0
+        # The header (name, contact, summary) anchors the resume, so keep it when it fits
+        if self.chunks and self.chunks[0]["section"] == "header":
+            header = self.chunks[0]
+            if header["tokens"] <= max_tokens:
+                selected.append(header)
+                used += header["tokens"]
+        for _, chunk in ranked + rest:
+            if chunk in selected:
+                continue
+            if used + chunk["tokens"] > max_tokens:
+                continue
+            selected.append(chunk)
+            used += chunk["tokens"]
+        return sorted(selected, key=lambda c: c["position"])
+
+    def relevant_text(self, query: str, max_tokens=1200) -> str:
+        """Resume text trimmed to the chunks most relevant to `query`."""
+        if self.total_tokens <= max_tokens:
+            return self.resume_text
+
+        parts, last_section = [], None
+        for chunk in self.top_chunks(query, max_tokens=max_tokens):
+            if chunk["section"] != last_section and chunk["section"] != "header":
+                parts.append(f"\n{chunk['section']}")
+            parts.append(chunk["text"])
+            last_section = chunk["section"]
+        return "\n".join(parts).strip()
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -4,10 +4,46 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 
-def get_jobs_from_remoteok(keyword,location=""):
+JOB_ROW = 'tr.job'
+
+def _parse_job_card(card):
+    title = card.find_element(By.CSS_SELECTOR, 'td.position h2').text
+    company = card.find_element(By.CSS_SELECTOR, 'td.company h3').text
+    link_element = card.find_element(By.CSS_SELECTOR, 'a.preventLink')
+    full_link = link_element.get_attribute('href')
+    try:
+        location = card.find_element(By.CSS_SELECTOR, 'div.location').text
+    except:
+        location = "Remote"
+
+    job_posting = f"{title} role at {company} in {location}."
+
+    return {
+        "title": title,
+        "company": company,
+        "link": full_link,
+        "location": location,
+        "job_posting": job_posting
+    }
+
+def _more_rows_than(count):
+    """Wait condition: more job rows are in the DOM than we have already seen."""
+    def condition(driver):
+        return len(driver.find_elements(By.CSS_SELECTOR, JOB_ROW)) > count
+    return condition
+
+def iter_jobs_from_remoteok(keyword, location="", max_results=50, time_budget=60, scroll_timeout=5):
+    """
+    Yield jobs from RemoteOK as their rows appear, scrolling to load more.
+
+    Stops after `max_results` jobs, after `time_budget` seconds, when scrolling
+    loads no new rows within `scroll_timeout` seconds, or as soon as the caller
+    stops iterating (the browser is closed when the generator is closed).
+    """
     # Clean up keyword for URL
     keyword = keyword.lower().strip().replace(" ", "-")
     url = f"https://remoteok.com/remote-{keyword}-jobs"
@@ -21,44 +57,49 @@ def get_jobs_from_remoteok(keyword,location=""):
     options.add_argument("--disable-dev-shm-usage")
 
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    deadline = time.monotonic() + time_budget
     driver.get(url)
 
-    jobs = []
-
     try:
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'tr.job'))
+        WebDriverWait(driver, min(30, time_budget)).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, JOB_ROW))
         )
 
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        seen_rows = 0
+        seen_links = set()
+        yielded = 0
 
-        cards = driver.find_elements(By.CSS_SELECTOR, 'tr.job')
+        while yielded < max_results and time.monotonic() < deadline:
+            cards = driver.find_elements(By.CSS_SELECTOR, JOB_ROW)
 
-        for card in cards:
-            try:
-                title = card.find_element(By.CSS_SELECTOR, 'td.position h2').text
-                company = card.find_element(By.CSS_SELECTOR, 'td.company h3').text
-                link_element = card.find_element(By.CSS_SELECTOR, 'a.preventLink')
-                full_link = link_element.get_attribute('href')
+            for card in cards[seen_rows:]:
                 try:
-                    location = card.find_element(By.CSS_SELECTOR, 'div.location').text
-                except:
-                    location = "Remote"
-
-                job_posting = f"{title} role at {company} in {location}."
-
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "link": full_link,
-                    "location": location,
-                    "job_posting": job_posting
-                })
-            except Exception:
-                continue
+                    job = _parse_job_card(card)
+                except Exception:
+                    continue
+                if job["link"] in seen_links:
+                    continue
+                seen_links.add(job["link"])
+                yield job
+                yielded += 1
+                if yielded >= max_results:
+                    return
+            seen_rows = len(cards)
+
+            # Scroll to trigger lazy loading, then wait until new rows actually show up
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                WebDriverWait(driver, min(scroll_timeout, remaining), poll_frequency=0.2).until(
+                    _more_rows_than(seen_rows)
+                )
+            except TimeoutException:
+                break
 
     finally:
         driver.quit()
 
-    return jobs
+def get_jobs_from_remoteok(keyword, location="", max_results=50, time_budget=60):
+    return list(iter_jobs_from_remoteok(keyword, location, max_results=max_results, time_budget=time_budget))
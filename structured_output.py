@@ -0,0 +1,247 @@
+import json
+import logging
+import re
+from collections import Counter
+
+from langchain_core.prompts import PromptTemplate
+
+logger = logging.getLogger(__name__)
+
+# How each structured response was recovered: "direct", "repaired", "corrected" or "failed"
+repair_stats = Counter()
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+correction_template = """The text below was supposed to be valid JSON but could not be used.
+
+Error:
+{error}
+
+Text:
+{broken_output}
+
+{format_instructions}
+
+Return ONLY the corrected JSON, with no preamble and no code fences."""
+
+
+_decoder = json.JSONDecoder()
+
+# Upper bound on how many `{` / `[` positions are tried as the start of the JSON value
+MAX_CANDIDATE_STARTS = 20
+
+
+def strip_fences(text: str) -> str:
+    text = text.strip()
+    fenced = _FENCE_RE.search(text)
+    return fenced.group(1).strip() if fenced else text
+
+
+def candidate_starts(text: str) -> list[int]:
+    """Positions where a JSON object or array could begin; prose may contain brackets too."""
+    return [i for i, ch in enumerate(text) if ch in "{["][:MAX_CANDIDATE_STARTS]
+
+
+def _outside_strings(text: str, fix):
+    """Apply `fix` to every chunk of `text` that is not inside a JSON string."""
+    out, chunk, in_string, escape = [], [], False, False
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            out.append(fix("".join(chunk)))
+            chunk = []
+            out.append(ch)
+            in_string = True
+        else:
+            chunk.append(ch)
+    out.append(fix("".join(chunk)))
+    return "".join(out)
+
+
+def fix_common_mistakes(text: str) -> str:
+    """Remove trailing commas and replace Python literals outside of strings."""
+    def fix(chunk):
+        chunk = re.sub(r"\b(True|False|None)\b", lambda m: _PY_LITERALS[m.group(1)], chunk)
+        return _TRAILING_COMMA_RE.sub(r"\1", chunk)
+    return _outside_strings(text, fix)
+
+
+def truncate_to_last_valid(text: str):
+    """
+    Cut a truncated JSON document back to its last complete element and close
+    any open brackets. Returns the parsed value, or raises ValueError.
+    """
+    stack, in_string, escape = [], False, False
+    cut_points = []  # (index to cut at, brackets still open at that point)
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                try:
+                    return json.loads(text[:i + 1])
+                except ValueError:
+                    break
+            cut_points.append((i + 1, list(stack)))
+        elif ch == "," and stack:
+            cut_points.append((i, list(stack)))
+
+    closers = {"{": "}", "[": "]"}
+    for index, open_brackets in reversed(cut_points):
+        candidate = text[:index].rstrip().rstrip(",")
+        candidate += "".join(closers[b] for b in reversed(open_brackets))
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    raise ValueError("No complete JSON element to recover")
+
+
+def _recover(text: str, start: int):
+    """
+    (end, value) for the JSON value starting at `start`: complete as is, after
+    fixing common mistakes, or truncated to its last complete element. `end` is
+    the end of the text for repaired values. Returns None if nothing parses.
+    """
+    try:
+        value, end = _decoder.raw_decode(text, start)
+        return end, value
+    except ValueError:
+        pass
+    candidate = fix_common_mistakes(text[start:])
+    try:
+        value, _ = _decoder.raw_decode(candidate)
+        return len(text), value
+    except ValueError:
+        pass
+    try:
+        return len(text), truncate_to_last_valid(candidate)
+    except ValueError:
+        return None
+
+
+def iter_repairs(text: str):
+    """
+    Yield parsed JSON values recovered from `text`, best guesses first.
+
+    Outer values come before anything nested inside them, even when the outer
+    value had to be truncated: a cut-off list of jobs must not be replaced by
+    one complete job from inside it. Within each group longer values come first.
+    """
+    text = strip_fences(text)
+    recovered = []
+    for start in candidate_starts(text):
+        result = _recover(text, start)
+        if result is not None:
+            recovered.append((start, result[0], result[1]))
+
+    def nested(item):
+        return any(other[0] < item[0] < other[1] for other in recovered if other is not item)
+
+    by_length = sorted(recovered, key=lambda item: item[0] - item[1])
+    for item in [item for item in by_length if not nested(item)] + [item for item in by_length if nested(item)]:
+        yield item[2]
+
+
+def repair_json(text: str):
+    """Try increasingly aggressive local fixes and return the parsed JSON value."""
+    for value in iter_repairs(text):
+        return value
+    raise ValueError("No complete JSON element to recover")
+
+
+def _validate_repaired(text, validate):
+    """First locally repaired value that passes `validate`."""
+    error = ValueError("No complete JSON element to recover")
+    for value in iter_repairs(text):
+        try:
+            return validate(value)
+        except Exception as e:
+            error = e
+    raise error
+
+
+def parse_structured_output(text, validate=None, llm=None, format_instructions="", max_corrections=1):
+    """
+    Parse an LLM response into JSON and pass it through `validate`.
+
+    Local repair is tried first. Only if that fails is `llm` sent a short
+    correction request containing the broken output (not the original prompt).
+
+    Args:
+    text (str): Raw LLM output.
+    validate (callable): Turns the parsed JSON into the final result, raising on bad data.
+    llm: Chat model used for correction requests. No correction is attempted if None.
+    format_instructions (str): Schema description included in the correction request.
+    max_corrections (int): Maximum number of correction round-trips.
+    """
+    validate = validate or (lambda value: value)
+
+    try:
+        result = validate(json.loads(text))
+        repair_stats["direct"] += 1
+        return result
+    except Exception:
+        pass
+
+    try:
+        result = _validate_repaired(text, validate)
+        repair_stats["repaired"] += 1
+        return result
+    except Exception as e:
+        error = e
+
+    if llm is not None:
+        prompt = PromptTemplate.from_template(correction_template)
+        broken_output = text
+        for _ in range(max_corrections):
+            response = llm.invoke(prompt.format(
+                error=str(error)[:500],
+                broken_output=broken_output,
+                format_instructions=format_instructions
+            ))
+            broken_output = response.content
+            try:
+                result = _validate_repaired(broken_output, validate)
+                repair_stats["corrected"] += 1
+                return result
+            except Exception as e:
+                error = e
+
+    repair_stats["failed"] += 1
+    logger.error(f"Could not parse structured output: {error}")
+    logger.error(f"Raw response was: {text}")
+    raise ValueError(f"Could not parse structured output: {error}") from error
+
+
+def get_repair_stats():
+    """Counts and rates for how structured responses were recovered."""
+    total = sum(repair_stats.values())
+    stats = {"total": total}
+    for outcome in ("direct", "repaired", "corrected", "failed"):
+        stats[outcome] = repair_stats[outcome]
+        stats[f"{outcome}_rate"] = repair_stats[outcome] / total if total else 0.0
+    return stats
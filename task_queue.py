@@ -0,0 +1,234 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {DONE, FAILED, CANCELLED}
+
+DEFAULT_WORKERS = int(os.environ.get("ASPIRE_WORKERS", "4"))
+# Interview turns and recordings get their own workers so they never queue behind batch work
+DEFAULT_INTERACTIVE_WORKERS = int(os.environ.get("ASPIRE_INTERACTIVE_WORKERS", "4"))
+DEFAULT_SCRATCH_ROOT = os.path.join(tempfile.gettempdir(), "aspireai")
+# Scratch directories hold uploaded resumes, so idle sessions are cleared after this many seconds
+DEFAULT_SCRATCH_MAX_AGE = int(os.environ.get("ASPIRE_SCRATCH_MAX_AGE", str(2 * 3600)))
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """A unit of background work; its fields are read by the UI while it runs."""
+
+    def __init__(self, name, session_id):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.session_id = session_id
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._future = None
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Cancel before it starts, or ask a running job to stop at its next check."""
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def add_done_callback(self, fn):
+        """Call `fn(job)` once the job has finished, or right away if it already has."""
+        with self._callbacks_lock:
+            if not self.finished:
+                self._callbacks.append(fn)
+                return
+        self._call(fn)
+
+    def _finish(self, status):
+        with self._callbacks_lock:
+            self.status = status
+            self.finished_at = time.time()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            self._call(fn)
+
+    def _call(self, fn):
+        try:
+            fn(self)
+        except Exception:
+            logger.exception(f"Done callback of job {self.name} ({self.id}) failed")
+
+    def wait(self, timeout=None):
+        if self._future is not None:
+            try:
+                self._future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self
+
+
+class JobContext:
+    """Passed to every job function as its first argument."""
+
+    def __init__(self, job: Job, scratch_dir: str):
+        self.job = job
+        self.scratch_dir = scratch_dir
+
+    @property
+    def cancelled(self) -> bool:
+        return self.job.cancel_requested
+
+    def check_cancelled(self):
+        if self.job.cancel_requested:
+            raise JobCancelled()
+
+    def report(self, progress=None, message=None, partial=None):
+        """Update progress (0-1), a status message and/or partial results for the UI."""
+        if progress is not None:
+            self.job.progress = max(0.0, min(1.0, progress))
+        if message is not None:
+            self.job.message = message
+        if partial is not None:
+            self.job.partial = partial
+        self.check_cancelled()
+
+
+class JobQueue:
+    """
+    Process-wide worker pools for long-running work, shared by all Streamlit
+    sessions. Batch work (scraping, analyses, emails) and interactive work
+    (interview turns, recordings) run on separate pools, so a turn is never
+    stuck behind analyses waiting for their Groq budget. Each session gets its
+    own scratch directory so concurrent users never share temp files; it is
+    deleted once the session has been idle for `scratch_max_age` seconds.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, scratch_root=DEFAULT_SCRATCH_ROOT, keep_finished=600,
+                 scratch_max_age=DEFAULT_SCRATCH_MAX_AGE, interactive_workers=DEFAULT_INTERACTIVE_WORKERS):
+        self.scratch_root = scratch_root
+        self.keep_finished = keep_finished
+        self.scratch_max_age = scratch_max_age
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aspire-job")
+        self._interactive_executor = ThreadPoolExecutor(
+            max_workers=interactive_workers, thread_name_prefix="aspire-interactive"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def scratch_dir(self, session_id) -> str:
+        path = os.path.join(self.scratch_root, str(session_id))
+        os.makedirs(path, exist_ok=True)
+        # Every use counts as activity for prune_scratch
+        os.utime(path)
+        return path
+
+    def submit(self, fn, *args, name=None, session_id="shared", interactive=False, **kwargs) -> Job:
+        """
+        Run `fn(ctx, *args, **kwargs)` on the pool and return its Job.
+        Pass `interactive=True` for work a user is waiting on right now.
+        """
+        self.prune_scratch()
+        job = Job(name or getattr(fn, "__name__", "job"), session_id)
+        ctx = JobContext(job, self.scratch_dir(session_id))
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        executor = self._interactive_executor if interactive else self._executor
+        job._future = executor.submit(self._run, job, ctx, fn, args, kwargs)
+        return job
+
+    def _run(self, job, ctx, fn, args, kwargs):
+        if job.cancel_requested:
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        status = FAILED
+        try:
+            job.result = fn(ctx, *args, **kwargs)
+            job.progress = 1.0
+            status = CANCELLED if job.cancel_requested and job.result is None else DONE
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            logger.exception(f"Job {job.name} ({job.id}) failed")
+            job.error = str(e)
+        finally:
+            job._finish(status)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def jobs_for(self, session_id):
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    def cleanup_session(self, session_id):
+        """Cancel a session's jobs and delete its scratch directory."""
+        for job in self.jobs_for(session_id):
+            job.cancel()
+        shutil.rmtree(os.path.join(self.scratch_root, str(session_id)), ignore_errors=True)
+
+    def prune_scratch(self):
+        """Delete scratch directories of sessions that have been idle for `scratch_max_age` seconds."""
+        if not os.path.isdir(self.scratch_root):
+            return
+        cutoff = time.time() - self.scratch_max_age
+        with self._lock:
+            busy = {str(job.session_id) for job in self._jobs.values() if not job.finished}
+        for name in os.listdir(self.scratch_root):
+            path = os.path.join(self.scratch_root, name)
+            try:
+                idle = os.path.isdir(path) and os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if idle and name not in busy:
+                logger.info(f"Removing idle scratch directory {path}")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_finished
+        for job_id in [i for i, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def get_metrics(self):
+        with self._lock:
+            counts = {state: 0 for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+job_queue = JobQueue()
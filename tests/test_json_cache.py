@@ -0,0 +1,39 @@
+import json
+import os
+import threading
+
+from json_cache import JsonFileCache
+
+
+def test_concurrent_instances_keep_every_entry(tmp_path):
+    path = os.path.join(tmp_path, "cache", "results.json")
+
+    def fill(worker):
+        cache = JsonFileCache(path)
+        for i in range(500):
+            cache.set(f"{worker}:{i}", i)
+        cache.save()
+        cache.save()
+
+    threads = [threading.Thread(target=fill, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert len(json.load(f)) == 2000
+    assert os.listdir(os.path.dirname(path)) == ["results.json"]
+
+
+def test_unreadable_file_is_ignored_and_replaced(tmp_path):
+    path = os.path.join(tmp_path, "results.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    cache = JsonFileCache(path)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    cache.save()
+
+    assert JsonFileCache(path).get("a") == 1
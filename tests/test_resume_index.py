@@ -0,0 +1,41 @@
+from resume_index import ResumeIndex, estimate_tokens, split_resume
+
+
+def make_resume(jobs=12):
+    blocks = ["Jane Doe\njane@x.com", "EXPERIENCE"]
+    for i in range(jobs):
+        blocks.append(
+            f"Company {i} - Engineer\n"
+            f"- Built internal tooling for team {i} and maintained the deployment scripts.\n"
+            f"- Worked with stakeholders to plan quarterly roadmaps and reviewed designs."
+        )
+    blocks.append("SKILLS\nGo, Kubernetes, Terraform, PostgreSQL")
+    return "\n\n".join(blocks)
+
+
+def test_long_block_keeps_its_first_line_on_every_piece():
+    block = "Acme Corp - Senior Engineer\n" + "\n".join(f"- Shipped feature number {i} to production." for i in range(40))
+    chunks = split_resume("EXPERIENCE\n" + block, max_chunk_tokens=60)
+    assert len(chunks) > 1
+    assert all(chunk["text"].startswith("Acme Corp - Senior Engineer") for chunk in chunks)
+
+
+def test_relevant_chunks_come_first():
+    resume = make_resume() + "\n\nPROJECTS\n\nPython Django shop\n- Django REST API in Python."
+    index = ResumeIndex(resume)
+    text = index.relevant_text("Python Django developer", max_tokens=120)
+    assert "Python Django shop" in text
+    assert text.startswith("Jane Doe")
+
+
+def test_poor_match_still_fills_the_budget():
+    index = ResumeIndex(make_resume())
+    assert index.total_tokens > 300
+
+    text = index.relevant_text("Senior Python Developer role at Acme in Remote.", max_tokens=300)
+
+    assert text.startswith("Jane Doe")
+    assert "Company 0 - Engineer" in text
+    # Everything that fits is sent, not just the header
+    assert estimate_tokens(text) > 300 - max(chunk["tokens"] for chunk in index.chunks) - 20
+    assert estimate_tokens(text) <= 300 + 20
@@ -0,0 +1,28 @@
+import threading
+
+from interview.speculation import Speculator
+from task_queue import JobQueue
+
+
+def test_turn_discarded_while_running_is_cleaned_up(tmp_path):
+    queue = JobQueue(scratch_root=str(tmp_path))
+    discarded = []
+    speculator = Speculator(queue, on_discard=discarded.append)
+    release = threading.Event()
+
+    job = speculator.start("interview", "fingerprint", lambda ctx: release.wait(5) and {"audio_file": "a.mp3"})
+    speculator.discard("interview")
+    assert discarded == []
+
+    release.set()
+    job.wait(timeout=2)
+
+    assert discarded == [{"audio_file": "a.mp3"}]
+
+
+def test_stale_fingerprint_is_not_handed_out(tmp_path):
+    queue = JobQueue(scratch_root=str(tmp_path))
+    speculator = Speculator(queue)
+    speculator.start("interview", "old", lambda ctx: {"question": "Q"}).wait(timeout=2)
+
+    assert speculator.take("interview", "new") is None
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from structured_output import parse_structured_output, repair_json, repair_stats, truncate_to_last_valid
+
+
+def job_list(value):
+    # Like generate_cold_email.as_job_list, a single job object is accepted too
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(job, dict) for job in value):
+        raise ValueError("Expected a list of job objects")
+    return value
+
+
+def test_code_fences_are_stripped():
+    text = 'Here you go:\n```json\n{"role": "Engineer"}\n```'
+    assert repair_json(text) == {"role": "Engineer"}
+
+
+def test_trailing_commas_and_python_literals_are_fixed():
+    text = '{"skills": ["Python", "SQL",], "remote": True, "salary": None,}'
+    assert repair_json(text) == {"skills": ["Python", "SQL"], "remote": True, "salary": None}
+
+
+def test_commas_inside_strings_are_kept():
+    text = '{"description": "Python, SQL,]", "remote": False,}'
+    assert repair_json(text) == {"description": "Python, SQL,]", "remote": False}
+
+
+def test_truncated_value_is_cut_to_last_complete_element():
+    text = '{"role": "Engineer", "skills": ["Python", "SQL", "Dja'
+    assert repair_json(text) == {"role": "Engineer", "skills": ["Python", "SQL"]}
+
+
+def test_truncated_list_keeps_every_complete_job():
+    repair_stats.clear()
+    text = '[{"role": "A", "skills": ["Python"]}, {"role": "B", "skills": ["Go"]}, {"ro'
+    jobs = parse_structured_output(text, job_list)
+    assert [job["role"] for job in jobs] == ["A", "B"]
+    assert repair_stats["repaired"] == 1
+
+
+def test_brackets_in_prose_before_the_json():
+    text = 'Jobs found [see below] (2 of them): [{"role": "A"}, {"role": "B"}]'
+    assert parse_structured_output(text, job_list) == [{"role": "A"}, {"role": "B"}]
+
+
+def test_nested_value_is_used_when_outer_value_does_not_validate():
+    text = '{"note": "one job", "job": {"role": "A"}'
+
+    def single_job(value):
+        if "role" not in value:
+            raise ValueError("missing role")
+        return value
+
+    assert parse_structured_output(text, single_job) == {"role": "A"}
+
+
+def test_unrecoverable_text_raises():
+    repair_stats.clear()
+    with pytest.raises(ValueError):
+        parse_structured_output("no json here", job_list)
+    assert repair_stats["failed"] == 1
+    with pytest.raises(ValueError):
+        truncate_to_last_valid('{"role": ')
@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+
+from task_queue import CANCELLED, DONE, JobQueue
+
+
+def test_interactive_job_does_not_wait_for_batch_jobs(tmp_path):
+    queue = JobQueue(max_workers=1, interactive_workers=1, scratch_root=str(tmp_path))
+    release = threading.Event()
+    batch = [queue.submit(lambda ctx: release.wait(5)) for _ in range(3)]
+
+    turn = queue.submit(lambda ctx: "question", interactive=True).wait(timeout=2)
+
+    assert turn.status == DONE and turn.result == "question"
+    assert not batch[0].finished
+    release.set()
+
+
+def test_queued_job_can_be_cancelled(tmp_path):
+    queue = JobQueue(max_workers=1, scratch_root=str(tmp_path))
+    release = threading.Event()
+    queue.submit(lambda ctx: release.wait(5))
+    waiting = queue.submit(lambda ctx: "never")
+
+    waiting.cancel()
+    release.set()
+
+    assert waiting.wait(timeout=2).status == CANCELLED
+
+
+def test_idle_scratch_dirs_are_pruned(tmp_path):
+    queue = JobQueue(scratch_root=str(tmp_path), scratch_max_age=60)
+    idle = queue.scratch_dir("idle")
+    os.utime(idle, (time.time() - 120,) * 2)
+
+    queue.submit(lambda ctx: None, session_id="active").wait(timeout=2)
+
+    assert sorted(os.listdir(tmp_path)) == ["active"]
+
+
+def test_done_callback_runs_once_finished(tmp_path):
+    queue = JobQueue(max_workers=1, scratch_root=str(tmp_path))
+    release = threading.Event()
+    seen = []
+    job = queue.submit(lambda ctx: release.wait(5) and "result")
+    job.add_done_callback(lambda finished: seen.append(finished.status))
+    assert seen == []
+
+    release.set()
+    job.wait(timeout=2)
+    job.add_done_callback(lambda finished: seen.append(finished.result))
+
+    assert seen == [DONE, "result"]
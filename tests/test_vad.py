@@ -0,0 +1,81 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+
+from interview.vad import Calibration, EnergyVAD, frame_energy, wav_frames
+
+# 1.0 s of background noise, 1.8 s of voiced speech, 1.5 s of background noise (8 kHz, mono, 16-bit)
+ANSWER_WAV = os.path.join(os.path.dirname(__file__), "data", "answer.wav")
+SPEECH_SECONDS = 1.8
+
+
+def record_from_wav(*args, **kwargs):
+    for module in ("speech_recognition", "pydub", "groq", "langchain_groq"):
+        pytest.importorskip(module)
+    from interview.speech_to_text import record_from_wav
+    return record_from_wav(*args, **kwargs)
+
+
+def captured_seconds(pcm, path):
+    with wave.open(path, "rb") as wav:
+        return len(pcm) / (wav.getframerate() * wav.getsampwidth())
+
+
+def convert_to_8bit(src, dst):
+    with wave.open(src, "rb") as wav:
+        params = wav.getparams()
+        samples = np.frombuffer(wav.readframes(params.nframes), dtype="<i2")
+    with wave.open(dst, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(params.framerate)
+        wav.writeframes(((samples >> 8) + 128).astype(np.uint8).tobytes())
+
+
+def test_record_from_wav_stops_after_trailing_silence():
+    pcm = record_from_wav(ANSWER_WAV, trailing_silence_ms=700)
+
+    seconds = captured_seconds(pcm, ANSWER_WAV)
+    # The speech plus at most the pre-roll and kept silence, none of the long tail
+    assert SPEECH_SECONDS - 0.2 <= seconds <= SPEECH_SECONDS + 0.7
+
+
+def test_record_from_wav_8bit(tmp_path):
+    path = os.path.join(tmp_path, "answer_8bit.wav")
+    convert_to_8bit(ANSWER_WAV, path)
+
+    pcm = record_from_wav(path)
+
+    assert pcm is not None
+    assert SPEECH_SECONDS - 0.2 <= captured_seconds(pcm, path) <= SPEECH_SECONDS + 0.7
+
+
+def test_record_from_wav_returns_none_without_speech(tmp_path):
+    path = os.path.join(tmp_path, "silence.wav")
+    with wave.open(ANSWER_WAV, "rb") as src, wave.open(path, "wb") as dst:
+        dst.setparams(src.getparams())
+        # Only the leading background noise
+        dst.writeframes(src.readframes(src.getframerate()))
+
+    assert record_from_wav(path) is None
+
+
+def test_wav_frames_rejects_stereo(tmp_path):
+    path = os.path.join(tmp_path, "stereo.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(bytes(8000))
+
+    with pytest.raises(ValueError):
+        next(wav_frames(path))
+
+
+def test_8bit_energy_and_threshold():
+    assert frame_energy(bytes([128] * 240), sample_width=1) == 0.0
+    loud = np.where(np.arange(240) % 2, 178, 78).astype(np.uint8).tobytes()
+    vad = EnergyVAD(Calibration(noise_floor=1.0, sample_rate=8000, sample_width=1))
+    assert vad.is_speech(loud)